@@ -1,7 +1,12 @@
 from fastapi import FastAPI
+from .responses import ORJSONResponse
 from .routes import search, vin, scrape, analytics, uploads
 
-app = FastAPI(title="VIN Intelligence API", version="0.1.0")
+app = FastAPI(
+    title="VIN Intelligence API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.include_router(search.router, prefix="/search", tags=["search"])
 app.include_router(vin.router, prefix="/vin", tags=["vin"])
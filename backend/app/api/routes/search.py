@@ -1,35 +1,235 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import base64
+import binascii
+import hashlib
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import DateTime, Float, and_, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import LRUCache
 
+from backend.app.api.responses import ORJSONResponse
 from backend.app.db import models
 from backend.app.db.session import get_session
 
 MAX_PAGE_SIZE = 200
 DEFAULT_PAGE_SIZE = 50
+DEALER_CACHE_SECONDS = 300
 
 SORT_OPTIONS = {
-    "delta_vs_msrp_asc": lambda: (
+    "delta_vs_msrp_asc": (
         models.Listing.price_delta_msrp.asc().nulls_last(),
         models.Listing.advertised_price.asc().nulls_last(),
     ),
-    "delta_vs_msrp_desc": lambda: (
+    "delta_vs_msrp_desc": (
         models.Listing.price_delta_msrp.desc().nulls_last(),
         models.Listing.advertised_price.asc().nulls_last(),
     ),
-    "price_asc": lambda: (models.Listing.advertised_price.asc().nulls_last(),),
-    "price_desc": lambda: (models.Listing.advertised_price.desc().nulls_last(),),
-    "last_seen_desc": lambda: (models.Listing.last_seen_at.desc(),),
+    "price_asc": (models.Listing.advertised_price.asc().nulls_last(),),
+    "price_desc": (models.Listing.advertised_price.desc().nulls_last(),),
+    "last_seen_desc": (models.Listing.last_seen_at.desc(),),
 }
+# Appended to every sort so ordering is total (vin alone is not unique).
+TIEBREAK_ORDER = (models.Listing.dealer_id.asc(), models.Listing.vin.asc())
+
+# Sorts that support cursor (keyset) pagination: (column, ascending) pairs that
+# mirror SORT_OPTIONS. Every sort is made total by the (dealer_id, vin) tiebreak.
+KEYSET_SORTS = {
+    "delta_vs_msrp_asc": (
+        (models.Listing.price_delta_msrp, True),
+        (models.Listing.advertised_price, True),
+    ),
+    "price_asc": ((models.Listing.advertised_price, True),),
+    "last_seen_desc": ((models.Listing.last_seen_at, False),),
+}
+TIEBREAK_KEYS = ((models.Listing.dealer_id, True), (models.Listing.vin, True))
+
+# Postgres renders each row (and the page) as JSON so no ORM objects are hydrated.
+# Numeric columns are cast to double precision so they arrive as plain floats.
+ROW_JSON = func.json_build_object(
+    "vin", models.Listing.vin,
+    "dealer_id", models.Listing.dealer_id,
+    "model", models.Vehicle.model,
+    "year", models.Vehicle.year,
+    "trim", models.Vehicle.trim,
+    "status", models.Listing.status,
+    "advertised_price", cast(models.Listing.advertised_price, Float),
+    "msrp", cast(models.Vehicle.msrp, Float),
+    "price_delta_msrp", cast(models.Listing.price_delta_msrp, Float),
+    "vdp_url", models.Listing.vdp_url,
+    "first_seen_at", models.Listing.first_seen_at,
+    "last_seen_at", models.Listing.last_seen_at,
+    "features", models.Vehicle.features,
+    "below_msrp", func.coalesce(models.Listing.price_delta_msrp < 0, False),
+)
+
+# Built once at import; Select is immutable so each request derives its own
+# filtered copy, and SQLAlchemy's compiled cache reuses the SQL per filter shape.
+# Dealer name/region come from the in-process dealer cache instead of a join.
+SEARCH_BASE = select(models.Listing.vin).join(models.Vehicle, models.Vehicle.vin == models.Listing.vin)
+
+# Order-independent fingerprint of the listing fields a result depends on; summed
+# over the filtered set it changes with any status, price or freshness update,
+# including the absent-listing sweep, which leaves count and last_seen_at alone.
+ROW_STATE_HASH = func.hashtext(
+    func.concat_ws(
+        "|",
+        models.Listing.dealer_id,
+        models.Listing.vin,
+        models.Listing.status,
+        models.Listing.advertised_price,
+        models.Listing.price_delta_msrp,
+        models.Listing.vdp_url,
+        models.Listing.last_seen_at,
+    )
+)
+
+# Same joins, aggregated: the filtered set's size and state, used for ETag checks
+# and counts the page query cannot provide.
+PROBE_BASE = (
+    select(func.count(), func.sum(ROW_STATE_HASH), func.max(models.Vehicle.updated_at))
+    .select_from(models.Listing)
+    .join(models.Vehicle, models.Vehicle.vin == models.Listing.vin)
+)
+
+# Dedicated compiled-SQL cache for search so its statements are not evicted by
+# other traffic. Keys are statement shapes (filter presence, sort, cursor), and
+# the LRU bound keeps a long-running process from accumulating them forever.
+SEARCH_COMPILED_CACHE_SIZE = 256
+SEARCH_EXECUTION_OPTIONS = {"compiled_cache": LRUCache(SEARCH_COMPILED_CACHE_SIZE)}
+
+# {"epoch": refresh window, "dealers": {dealer_id: (name, region)}}
+# "tag" fingerprints the dealers so a rename or region change alters search ETags.
+_dealer_cache: Dict[str, Any] = {"epoch": None, "dealers": {}, "tag": None}
 
 router = APIRouter()
 
+
+def _apply_filters(
+    stmt,
+    *,
+    status: Optional[str],
+    model: Optional[str],
+    year: Optional[int],
+    trim: Optional[str],
+    dealer_ids: Optional[List[int]],
+    features: Optional[List[str]],
+    below_msrp: bool,
+):
+    if status:
+        stmt = stmt.where(models.Listing.status == status)
+
+    if model:
+        # Exact case-insensitive match served by idx_vehicles_lower_model_year.
+        stmt = stmt.where(func.lower(models.Vehicle.model) == model.lower())
+
+    if year:
+        stmt = stmt.where(models.Vehicle.year == year)
+
+    if trim:
+        stmt = stmt.where(models.Vehicle.trim.ilike(f"%{trim}%"))
+
+    if dealer_ids is not None:
+        stmt = stmt.where(models.Listing.dealer_id.in_(dealer_ids))
+
+    if features:
+        # One `features @> '[...]'` containment check answers all requested
+        # features with a single probe of idx_vehicles_features_gin.
+        stmt = stmt.where(models.Vehicle.features.contains(features))
+
+    if below_msrp:
+        stmt = stmt.where(models.Listing.price_delta_msrp < 0)
+
+    return stmt
+
+
+def _etag(query_key: Tuple[Any, ...], total: int, row_state: Optional[int], vehicles_at: Optional[datetime]) -> str:
+    """Weak tag over the normalized query, the filtered set's state and the dealer cache."""
+    stamp = vehicles_at.timestamp() if vehicles_at is not None else 0
+    digest = hashlib.blake2b(
+        repr((query_key, total, row_state, stamp, _dealer_cache["tag"])).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def _load_dealers(db: AsyncSession, *, refresh: bool = False) -> Dict[int, Tuple[str, Optional[str]]]:
+    """Return the small, slowly-changing dealers table, reloaded every DEALER_CACHE_SECONDS."""
+    epoch = int(time.time() // DEALER_CACHE_SECONDS)
+    if refresh or _dealer_cache["epoch"] != epoch:
+        result = await db.execute(select(models.Dealer.id, models.Dealer.name, models.Dealer.region))
+        _dealer_cache["dealers"] = {dealer_id: (name, region) for dealer_id, name, region in result}
+        _dealer_cache["tag"] = hashlib.blake2b(
+            repr(sorted(_dealer_cache["dealers"].items())).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        _dealer_cache["epoch"] = epoch
+    return _dealer_cache["dealers"]
+
+
+def _encode_cursor(keys: Sequence[Tuple[Any, bool]], row: Dict[str, Any]) -> str:
+    values = [row[column.key] for column, _ in keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(keys: Sequence[Tuple[Any, bool]], cursor: str) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, binascii.Error) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    decoded: List[Any] = []
+    for (column, _), value in zip(keys, values):
+        if value is None:
+            decoded.append(None)
+        elif isinstance(column.type, DateTime):
+            try:
+                decoded.append(datetime.fromisoformat(value))
+            except (TypeError, ValueError) as exc:
+                raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        elif isinstance(value, float):
+            decoded.append(Decimal(str(value)))
+        elif isinstance(value, (int, str)):
+            decoded.append(value)
+        else:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return decoded
+
+
+def _after_cursor(keys: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """Rows ordered strictly after ``values`` under ``keys`` (NULLs sort last)."""
+    clauses = []
+    equal = []
+    for (column, ascending), value in zip(keys, values):
+        if value is None:
+            # Only rows tied on NULL can follow a NULL key.
+            equal.append(column.is_(None))
+            continue
+        after = column > value if ascending else column < value
+        if column.expression.nullable:
+            after = or_(after, column.is_(None))
+        clauses.append(and_(*equal, after))
+        equal.append(column == value)
+    return or_(*clauses)
+
+
 @router.get("")
 async def search(
+    request: Request,
     model: Optional[str] = None,
     year: Optional[int] = None,
     trim: Optional[str] = None,
@@ -40,86 +240,113 @@ async def search(
     page: int = 1,
     size: int = 50,
     sort: str = "delta_vs_msrp_asc",
-    db: Session = Depends(get_session),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_session),
 ):
     if page < 1 or size < 1:
         raise HTTPException(status_code=400, detail="page and size must be >= 1")
     size = min(size, MAX_PAGE_SIZE)
 
-    stmt = (
-        select(models.Listing, models.Vehicle, models.Dealer)
-        .join(models.Vehicle, models.Vehicle.vin == models.Listing.vin)
-        .join(models.Dealer, models.Dealer.id == models.Listing.dealer_id)
+    status_filter = status.lower() if status else None
+    if status_filter == "all":
+        status_filter = None
+    order_by = SORT_OPTIONS.get(sort)
+    if order_by is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort option '{sort}'")
+
+    dealers = await _load_dealers(db)
+    dealer_ids = None
+    if region:
+        dealer_ids = [dealer_id for dealer_id, (_, dealer_region) in dealers.items() if dealer_region == region]
+        if not dealer_ids:
+            dealers = await _load_dealers(db, refresh=True)
+            dealer_ids = [dealer_id for dealer_id, (_, dealer_region) in dealers.items() if dealer_region == region]
+
+    filters = dict(
+        status=status_filter,
+        model=model,
+        year=year,
+        trim=trim,
+        dealer_ids=dealer_ids,
+        features=features,
+        below_msrp=below_msrp,
     )
+    filtered_stmt = _apply_filters(SEARCH_BASE, **filters)
+    probe_stmt = _apply_filters(PROBE_BASE, **filters)
 
-    if status and status.lower() != "all":
-        stmt = stmt.where(models.Listing.status == status.lower())
+    # Everything that shapes the response body besides the data itself.
+    query_key = (model, year, trim, region, tuple(features or ()), below_msrp, status, sort, page, size, cursor)
 
-    if model:
-        stmt = stmt.where(models.Vehicle.model.ilike(model))
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # The query plus the filtered set's size and state identify the result; on
+        # a match skip the page query and encoding entirely.
+        total, row_state, vehicles_at = (
+            await db.execute(probe_stmt, execution_options=SEARCH_EXECUTION_OPTIONS)
+        ).one()
+        etag = _etag(query_key, total, row_state, vehicles_at)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-    if year:
-        stmt = stmt.where(models.Vehicle.year == year)
+    keyset = KEYSET_SORTS.get(sort)
+    if keyset is not None:
+        keyset = keyset + TIEBREAK_KEYS
+    if cursor and keyset is None:
+        raise HTTPException(status_code=400, detail=f"Sort option '{sort}' does not support cursors")
 
-    if trim:
-        stmt = stmt.where(models.Vehicle.trim.ilike(f"%{trim}%"))
+    order_by = order_by + TIEBREAK_ORDER
+    page_stmt = filtered_stmt.with_only_columns(
+        ROW_JSON.label("row"),
+        func.row_number().over(order_by=order_by).label("position"),
+        func.count().over().label("total"),
+        func.sum(ROW_STATE_HASH).over().label("row_state"),
+        func.max(models.Vehicle.updated_at).over().label("vehicles_at"),
+    ).order_by(*order_by)
+    if cursor:
+        # Keyset pagination: seek past the previous page instead of OFFSET.
+        page_stmt = page_stmt.where(_after_cursor(keyset, _decode_cursor(keyset, cursor)))
+    else:
+        page_stmt = page_stmt.offset((page - 1) * size)
+    page_stmt = page_stmt.limit(size).subquery()
 
-    if region:
-        stmt = stmt.where(models.Dealer.region == region)
+    rows, total, row_state, vehicles_at = (await db.execute(
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(page_stmt.c.row, page_stmt.c.position)),
+                func.json_build_array(),
+            ),
+            func.max(page_stmt.c.total),
+            func.max(page_stmt.c.row_state),
+            func.max(page_stmt.c.vehicles_at),
+        ),
+        execution_options=SEARCH_EXECUTION_OPTIONS,
+    )).one()
 
-    if features:
-        for feature in features:
-            stmt = stmt.where(models.Vehicle.features.contains([feature]))
+    if total is None or cursor:
+        # The window aggregates only see rows that survive the cursor predicate
+        # and are absent on empty pages; fall back to the explicit probe there.
+        total, row_state, vehicles_at = 0, None, None
+        if page > 1 or cursor:
+            total, row_state, vehicles_at = (
+                await db.execute(probe_stmt, execution_options=SEARCH_EXECUTION_OPTIONS)
+            ).one()
 
-    if below_msrp:
-        stmt = stmt.where(models.Listing.price_delta_msrp < 0)
+    if any(row["dealer_id"] not in dealers for row in rows):
+        # A dealer added since the last refresh; reload rather than wait it out.
+        dealers = await _load_dealers(db, refresh=True)
+    for row in rows:
+        row["dealer_name"], row["region"] = dealers.get(row["dealer_id"], (None, None))
 
-    sort_fn = SORT_OPTIONS.get(sort)
-    if not sort_fn:
-        raise HTTPException(status_code=400, detail=f"Unsupported sort option '{sort}'")
+    next_cursor = None
+    if keyset is not None and len(rows) == size:
+        next_cursor = _encode_cursor(keyset, rows[-1])
 
-    filtered_stmt = stmt
-
-    total = db.execute(select(func.count()).select_from(filtered_stmt.subquery())).scalar_one()
-
-    order_by = sort_fn()
-    stmt = filtered_stmt.order_by(*order_by)
-    stmt = stmt.offset((page - 1) * size).limit(size)
-
-    results = db.execute(stmt).all()
-
-    rows = []
-    for listing, vehicle, dealer in results:
-        advertised_price = float(listing.advertised_price) if listing.advertised_price is not None else None
-        msrp_value = float(vehicle.msrp) if vehicle.msrp is not None else None
-        price_delta = float(listing.price_delta_msrp) if listing.price_delta_msrp is not None else None
-
-        rows.append(
-            {
-                "vin": listing.vin,
-                "dealer_id": listing.dealer_id,
-                "dealer_name": dealer.name,
-                "region": dealer.region,
-                "model": vehicle.model,
-                "year": vehicle.year,
-                "trim": vehicle.trim,
-                "status": listing.status,
-                "advertised_price": advertised_price,
-                "msrp": msrp_value,
-                "price_delta_msrp": price_delta,
-                "vdp_url": listing.vdp_url,
-                "first_seen_at": listing.first_seen_at.isoformat() if listing.first_seen_at else None,
-                "last_seen_at": listing.last_seen_at.isoformat() if listing.last_seen_at else None,
-                "features": vehicle.features,
-                "below_msrp": price_delta is not None and price_delta < 0,
-            }
-        )
-
-    return {
+    return ORJSONResponse({
         "page": page,
         "size": size,
         "total": total,
         "rows": rows,
+        "next_cursor": next_cursor,
         "applied_filters": {
             "model": model,
             "year": year,
@@ -130,4 +357,4 @@ async def search(
             "status": status,
             "sort": sort,
         },
-    }
+    }, headers={"ETag": _etag(query_key, total, row_state, vehicles_at)})
@@ -1,18 +1,34 @@
+import asyncio
+import tempfile
+
 from fastapi import APIRouter, UploadFile, File, HTTPException
 
 from backend.app.services.upload_ingest import ingest_vehicle_locator_upload
 
 router = APIRouter()
 
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
 
 @router.post("")
 async def upload(file: UploadFile = File(...)):
-    content = await file.read()
-    try:
-        return ingest_vehicle_locator_upload(file.filename, content)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-    except HTTPException:
-        raise
-    except Exception as exc:  # pragma: no cover - unexpected failure
-        raise HTTPException(status_code=500, detail="Upload failed") from exc
+    # Spool the upload in chunks: small files stay in memory, large ones spill
+    # to disk instead of being read into a single bytes object.
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        while chunk := await file.read(CHUNK_SIZE):
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            # Parsing and ingest are blocking (pandas + sync DB session); run
+            # them in a worker thread so the event loop keeps serving requests.
+            return await asyncio.to_thread(ingest_vehicle_locator_upload, file.filename, spool)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except HTTPException:
+            raise
+        except Exception as exc:  # pragma: no cover - unexpected failure
+            raise HTTPException(status_code=500, detail="Upload failed") from exc
+
+
+__all__ = ["router"]
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from backend.app.api.responses import ORJSONResponse
+
 router = APIRouter()
 
 @router.get("/{vin}")
 async def vin_detail(vin: str):
     """Return vehicle spec, active listings, price timeline, last observation."""
-    return {"vin": vin, "vehicle": {}, "listings": [], "price_events": []}
+    return ORJSONResponse({"vin": vin, "vehicle": {}, "listings": [], "price_events": []})
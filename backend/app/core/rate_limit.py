@@ -1,22 +1,136 @@
 import asyncio, time
+from collections import OrderedDict
 from typing import Optional
 
 class TokenBucket:
     """Simple token bucket for requests-per-minute rate limiting."""
     def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
         self.rate = rate_per_minute / 60.0
         self.capacity = capacity or rate_per_minute
         self.tokens = self.capacity
         self.last = time.monotonic()
         self.lock = asyncio.Lock()
 
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last = now
+
     async def acquire(self, n: int = 1):
-        async with self.lock:
-            while self.tokens < n:
-                now = time.monotonic()
-                elapsed = now - self.last
-                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-                self.last = now
-                if self.tokens < n:
-                    await asyncio.sleep(0.05)
-            self.tokens -= n
+        if n > self.capacity:
+            raise ValueError(f"Cannot acquire {n} tokens from a bucket of capacity {self.capacity}")
+        while True:
+            # Only the refill/deduct runs under the lock; waiters sleep outside it
+            # so one starved caller never blocks the others.
+            async with self.lock:
+                self._refill()
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                # Sleep exactly until the deficit has refilled instead of polling.
+                deficit = n - self.tokens
+                wait = deficit / self.rate
+            await asyncio.sleep(max(wait, 0.0))
+
+
+class KeyedTokenBucket:
+    """Independent token buckets per key (e.g. upstream host) so callers only
+    contend with others sharing their key. Least recently used keys are evicted
+    once ``max_keys`` is exceeded."""
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None, *, max_keys: int = 1024):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def _bucket(self, key: str) -> TokenBucket:
+        # Get-or-create never awaits, so it is atomic on the event loop and needs
+        # no guard lock.
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_minute, self.capacity)
+            self.buckets[key] = bucket
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket
+
+    async def acquire(self, key: str, n: int = 1):
+        await self._bucket(key).acquire(n)
+
+
+class AdmissionController:
+    """Admits a caller once both a concurrency slot and a rate token are free.
+
+    Checking both under one ``asyncio.Condition`` costs a single await per
+    admission (instead of a bucket acquire followed by a semaphore), and the
+    concurrency cap can be changed at runtime with :meth:`resize`. Tokens are
+    refilled lazily from the monotonic clock, so no background task is needed.
+    Use as ``async with controller: ...``.
+    """
+    def __init__(self, max_concurrency: int, rate_per_minute: int, capacity: Optional[int] = None):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.last = time.monotonic()
+        self._cond = asyncio.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while True:
+                timeout: Optional[float] = None
+                if self.active < self.max_concurrency:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.active += 1
+                        return
+                    # A slot is free but the bucket is empty: nobody will notify when
+                    # it refills, so wake up once the deficit has been earned back.
+                    timeout = (1 - self.tokens) / self.rate
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout)
+                except TimeoutError:
+                    pass
+                except asyncio.CancelledError:
+                    # The wake-up may have been meant for this waiter; pass it on.
+                    self._cond.notify(1)
+                    raise
+
+    async def release(self) -> None:
+        # Shielded so a caller cancelled on its way out still frees its slot.
+        await asyncio.shield(self._release())
+
+    async def _release(self) -> None:
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify(1)
+
+    async def resize(self, max_concurrency: int) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        async with self._cond:
+            self.max_concurrency = max_concurrency
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.release()
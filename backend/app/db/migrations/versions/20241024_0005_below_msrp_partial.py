@@ -0,0 +1,30 @@
+"""Add partial index for below-MSRP search
+
+Revision ID: 0005_below_msrp_partial
+Revises: 0004_upload_columns
+Create Date: 2025-10-24 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_below_msrp_partial"
+down_revision = "0004_upload_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_listings_below_msrp",
+        "listings",
+        ["status", "price_delta_msrp"],
+        postgresql_where=sa.text("price_delta_msrp < 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_listings_below_msrp", table_name="listings")
@@ -0,0 +1,25 @@
+"""Add lower(model) expression index for case-insensitive model search
+
+Revision ID: 0006_vehicle_model_lower
+Revises: 0005_below_msrp_partial
+Create Date: 2025-10-24 00:30:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_vehicle_model_lower"
+down_revision = "0005_below_msrp_partial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_vehicles_lower_model_year", "vehicles", [sa.text("lower(model)"), "year"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_vehicles_lower_model_year", table_name="vehicles")
@@ -0,0 +1,29 @@
+"""Record page content hash and raw blob key on scrape tasks
+
+Revision ID: 0007_scrape_task_content_hash
+Revises: 0006_vehicle_model_lower
+Create Date: 2025-10-25 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_scrape_task_content_hash"
+down_revision = "0006_vehicle_model_lower"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("scrape_tasks", sa.Column("content_hash", sa.Text(), nullable=True))
+    op.add_column("scrape_tasks", sa.Column("raw_blob_key", sa.Text(), nullable=True))
+    op.create_index("idx_scrape_tasks_dealer_content_hash", "scrape_tasks", ["dealer_id", "content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_scrape_tasks_dealer_content_hash", table_name="scrape_tasks")
+    op.drop_column("scrape_tasks", "raw_blob_key")
+    op.drop_column("scrape_tasks", "content_hash")
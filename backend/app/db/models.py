@@ -114,6 +114,8 @@ class ScrapeTask(Base):
     error = Column(Text)
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
+    content_hash = Column(Text)  # hash of the stored raw page, for blob reuse
+    raw_blob_key = Column(Text)
 
 class Upload(Base):
     __tablename__ = "uploads"
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator, Iterator
+from typing import AsyncIterator, Iterator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.app.core.settings import settings
@@ -13,6 +14,19 @@ ENGINE = create_engine(settings.database_url, future=True, echo=False, pool_pre_
 
 SessionLocal = sessionmaker(bind=ENGINE, class_=Session, autoflush=False, autocommit=False, expire_on_commit=False)
 
+# API routes run on the event loop, so they use the async engine (psycopg's async
+# driver is picked automatically for the same postgresql+psycopg URL).
+ASYNC_ENGINE = create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=ASYNC_ENGINE, autoflush=False, expire_on_commit=False)
+
 
 @contextmanager
 def session_scope() -> Iterator[Session]:
@@ -27,9 +41,6 @@ def session_scope() -> Iterator[Session]:
         session.close()
 
 
-def get_session() -> Generator[Session, None, None]:
-    session = SessionLocal()
-    try:
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        session.close()
@@ -0,0 +1,52 @@
+"""Shared HTTP client helpers for parsers that call dealer APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any
+
+import httpx
+
+
+class LoopLocalAsyncClient:
+    """Hands out one pooled ``httpx.AsyncClient`` per running event loop.
+
+    An AsyncClient's connections belong to the loop that opened them, so a
+    single module-level instance would break as soon as a second loop (a test,
+    a worker thread) used it. Owners of a loop close its clients with
+    :func:`aclose_async_clients` when they are done with it.
+    """
+
+    def __init__(self, **client_kwargs: Any) -> None:
+        self._client_kwargs = client_kwargs
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        _POOLS.add(self)
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**self._client_kwargs)
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's client; a later :meth:`get` opens a new one."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_POOLS: "weakref.WeakSet[LoopLocalAsyncClient]" = weakref.WeakSet()
+
+
+async def aclose_async_clients() -> None:
+    """Close every parser pool's client for the running loop."""
+    for pool in list(_POOLS):
+        await pool.aclose()
+
+
+__all__ = ["LoopLocalAsyncClient", "aclose_async_clients"]
@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin, urlsplit
 
 VIN_RE = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b", re.IGNORECASE)
+# Same pattern with ASCII-only word boundaries and case folding; identical
+# results on ASCII text and roughly twice as fast on large buffers.
+_ASCII_VIN_RE = re.compile(VIN_RE.pattern, re.IGNORECASE | re.ASCII)
 PRICE_RE = re.compile(r"\$[\s]*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)")
 URL_RE = re.compile(r"https?://[^\s\"')>]+", re.IGNORECASE)
 IMAGE_RE = re.compile(r"!\[[^\]]*\]\((https?://[^)]+)\)")
+_TAG_RE = re.compile(r"<[^>]+>")
+_CURRENCY_TRANS = str.maketrans("", "", "$, \t")
 
 ParsedRow = Dict[str, Optional[Union[str, float]]]
 
@@ -22,10 +30,137 @@ class ParserConfig:
     stock_patterns: Sequence[re.Pattern[str]] = field(
         default_factory=lambda: (re.compile(r"(?:stock\s*(?:#|number|no\.?)\s*[:\-]?\s*)([A-Z0-9-]+)", re.IGNORECASE),)
     )
+    # Lowercase substrings every stock_patterns match must contain; lines
+    # without any of them skip the stock regexes entirely.
+    stock_keywords: Sequence[str] = ("stock",)
+    _status_re: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    _status_groups: Tuple[Tuple[int, str], ...] = field(init=False, repr=False, compare=False)
+    _price_keyword_re: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    _price_keyword_ranks: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        pattern, groups = _build_status_matcher(tuple(self.status_map.items()))
+        object.__setattr__(self, "_status_re", pattern)
+        object.__setattr__(self, "_status_groups", groups)
+        pattern, ranks = _build_price_keyword_matcher(tuple(self.price_keywords_priority))
+        object.__setattr__(self, "_price_keyword_re", pattern)
+        object.__setattr__(self, "_price_keyword_ranks", ranks)
+
+
+@lru_cache(maxsize=None)
+def _build_status_matcher(
+    items: Tuple[Tuple[str, str], ...],
+) -> Tuple[re.Pattern[str], Tuple[Tuple[int, str], ...]]:
+    # One case-insensitive alternation (longest keys first) replaces the
+    # per-line upper() + substring scan over every status_map key. Each key
+    # gets its own capture group so a match resolves through lastindex
+    # without allocating a case-folded copy of the matched text; the group
+    # table keeps each key's position so status_map order still decides
+    # between several matches on one line. Cached per status_map so configs
+    # sharing a map share the compiled matcher.
+    if not items:
+        return re.compile(r"(?!)"), ((0, ""),)
+    lookup = {key.upper(): (rank, value) for rank, (key, value) in enumerate(items)}
+    keys = sorted(lookup, key=len, reverse=True)
+    pattern = re.compile(
+        r"\b(?:" + "|".join(f"({re.escape(key)})" for key in keys) + r")\b",
+        re.IGNORECASE,
+    )
+    groups = ((0, ""),) + tuple(lookup[key] for key in keys)
+    return pattern, groups
+
+
+@lru_cache(maxsize=None)
+def _build_price_keyword_matcher(
+    items: Tuple[Tuple[str, int], ...],
+) -> Tuple[re.Pattern[str], Tuple[int, ...]]:
+    # A zero-width lookahead tries every keyword (in list order, one capture
+    # group each) at every position of the line in a single pass, so the
+    # lowest matching group is exactly the first listed keyword the line
+    # contains -- the same answer as testing each keyword with "in".
+    if not items:
+        return re.compile(r"(?!)"), (0,)
+    pattern = re.compile("(?=(?:" + "|".join(f"({re.escape(keyword)})" for keyword, _ in items) + "))")
+    ranks = (0,) + tuple(priority for _, priority in items)
+    return pattern, ranks
+
+
+def _price_keyword_rank(lower: str, config: ParserConfig) -> int:
+    best: Optional[int] = None
+    for match in config._price_keyword_re.finditer(lower):
+        group = match.lastindex
+        if best is None or group < best:
+            best = group
+            if group == 1:
+                break
+    return config._price_keyword_ranks[best] if best is not None else 5
+
+
+@dataclass(slots=True)
+class _RowAccum:
+    """Per-VIN accumulator; slotted so _apply_line's updates skip dict probes."""
+
+    vin: str
+    advertised_price: Optional[float] = None
+    msrp: Optional[float] = None
+    vdp_url: Optional[str] = None
+    stock_number: Optional[str] = None
+    status: Optional[str] = None
+    image_url: Optional[str] = None
+    price_rank: float = float("inf")
+
+    def as_row(self) -> ParsedRow:
+        return {
+            "vin": self.vin,
+            "advertised_price": self.advertised_price,
+            "msrp": self.msrp,
+            "vdp_url": self.vdp_url,
+            "stock_number": self.stock_number,
+            "status": self.status,
+            "image_url": self.image_url,
+        }
+
+
+def _is_plain_link(link: str) -> bool:
+    # Links urljoin would rewrite: dot segments, stripped control characters
+    # and dangling "?"/"#" markers that urlunsplit drops.
+    return "/." not in link and link.isprintable() and not link.endswith(("?", "#")) and "?#" not in link
+
+
+def make_url_joiner(base_url: str) -> Callable[[Optional[str]], Optional[str]]:
+    """Return a urljoin(base_url, link) equivalent that parses base_url once.
+
+    Feed payloads repeat the same base for every row; absolute, protocol-relative
+    and root-relative links are assembled by concatenation, and anything that
+    would need dot-segment or control-character handling goes through urljoin.
+    """
+    parts = urlsplit(base_url)
+    scheme = parts.scheme
+    origin = f"{scheme}://{parts.netloc}" if scheme and parts.netloc else None
+    prefix = f"{scheme}://"
+
+    def join(link: Optional[str]) -> Optional[str]:
+        if not link:
+            return None
+        if origin is None or not _is_plain_link(link):
+            return urljoin(base_url, link)
+        if link.startswith("//"):
+            if link[2:3] not in ("", "/", "?", "#"):
+                return f"{scheme}:{link}"
+        elif link.startswith("/"):
+            return origin + link
+        elif link.startswith(prefix) and link[len(prefix) : len(prefix) + 1] not in ("", "/", "?", "#"):
+            return link
+        return urljoin(base_url, link)
+
+    return join
 
 
 def _strip_tags(raw: str) -> str:
-    return re.sub(r"<[^>]+>", " ", raw)
+    # Firecrawl markdown rarely carries tags; skip the whole-buffer copy then.
+    if "<" not in raw:
+        return raw
+    return _TAG_RE.sub(" ", raw)
 
 
 def _parse_price(token: str) -> Optional[float]:
@@ -39,12 +174,34 @@ def _parse_price(token: str) -> Optional[float]:
         return None
 
 
-def _extract_status(snippet: str, status_map: Dict[str, str]) -> Optional[str]:
-    upper_snippet = snippet.upper()
-    for pattern, normalized in status_map.items():
-        if pattern in upper_snippet:
-            return normalized
-    return None
+def parse_currency(value: Any) -> Optional[float]:
+    """Coerce an API price (``"$45,990"``, ``45990``) to a positive float, else None."""
+    if isinstance(value, str):
+        value = value.translate(_CURRENCY_TRANS)
+        if not value:
+            return None
+    elif value is None or isinstance(value, bool):
+        return None
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return None
+    return numeric if numeric > 0 else None
+
+
+def _extract_status(snippet: str, config: ParserConfig) -> Optional[str]:
+    pattern = config._status_re
+    match = pattern.search(snippet)
+    if match is None:
+        return None
+    groups = config._status_groups
+    best = groups[match.lastindex]
+    # Most lines carry at most one status keyword; only rescan past the first.
+    for match in pattern.finditer(snippet, match.end()):
+        candidate = groups[match.lastindex]
+        if candidate[0] < best[0]:
+            best = candidate
+    return best[1]
 
 
 def _extract_stock(snippet: str, patterns: Sequence[re.Pattern[str]]) -> Optional[str]:
@@ -67,57 +224,61 @@ def _extract_vdp_url(snippet: str, vin: str, url_keywords: Iterable[str]) -> Opt
 
 
 def _apply_line(
-    record: ParsedRow,
+    record: _RowAccum,
     line: str,
     config: ParserConfig,
+    lower: Optional[str] = None,
 ) -> None:
     if not line:
         return
 
-    lower = line.lower()
+    # Each extractor is gated on a literal its regex cannot match without, so
+    # most lines never enter the regex engine. Callers may pass the line
+    # already lowercased; otherwise lower() is only paid for lines that carry
+    # a price or a possible stock keyword.
 
-    if not record.get("image_url"):
+    if "![" in line and record.image_url is None:
         for match in IMAGE_RE.finditer(line):
             image_url = match.group(1)
             if any(token in image_url for token in ("loading_image", "img_controls", "placeholder")):
                 continue
-            record["image_url"] = image_url
+            record.image_url = image_url
             break
-    line_price = _parse_price(line)
-
-    if line_price is not None:
-        if "msrp" in lower or "sticker price" in lower:
-            if record["msrp"] is None:
-                record["msrp"] = line_price
-        else:
-            rank = None
-            for keyword, priority in config.price_keywords_priority:
-                if keyword in lower:
-                    rank = priority
-                    break
-            if rank is None and "$" in line:
-                rank = 5
-            if rank is not None:
-                current_rank = record.get("_price_rank", float("inf"))
-                current_price = record.get("advertised_price")
+
+    if "$" in line:
+        line_price = _parse_price(line)
+        if line_price is not None:
+            if lower is None:
+                lower = line.lower()
+            if "msrp" in lower or "sticker price" in lower:
+                if record.msrp is None:
+                    record.msrp = line_price
+            else:
+                rank = _price_keyword_rank(lower, config)
+                current_rank = record.price_rank
+                current_price = record.advertised_price
                 if rank < current_rank or (
                     rank == current_rank and (current_price is None or line_price < current_price)
                 ):
-                    record["advertised_price"] = line_price
-                    record["_price_rank"] = rank
-
-    stock_number = _extract_stock(line, config.stock_patterns)
-    if stock_number and not record.get("stock_number"):
-        record["stock_number"] = stock_number
-
-    status = _extract_status(line, config.status_map)
+                    record.advertised_price = line_price
+                    record.price_rank = rank
+
+    if not record.stock_number:
+        if lower is None:
+            lower = line.lower()
+        if any(keyword in lower for keyword in config.stock_keywords):
+            stock_number = _extract_stock(line, config.stock_patterns)
+            if stock_number:
+                record.stock_number = stock_number
+
+    status = _extract_status(line, config)
     if status:
-        record["status"] = status
+        record.status = status
 
-    if not record.get("vdp_url"):
-        vdp_url = _extract_vdp_url(line, record["vin"], config.url_keywords)
+    if "://" in line and not record.vdp_url:
+        vdp_url = _extract_vdp_url(line, record.vin, config.url_keywords)
         if vdp_url:
-            record["vdp_url"] = vdp_url
+            record.vdp_url = vdp_url
 
 
 def parse_inventory_with_config(markdown_or_html: str, config: ParserConfig) -> List[ParsedRow]:
@@ -125,44 +286,65 @@ def parse_inventory_with_config(markdown_or_html: str, config: ParserConfig) ->
     if not cleaned:
         return []
 
-    records: Dict[str, ParsedRow] = {}
-    current_vin: Optional[str] = None
+    # Locate every VIN with a single C-level scan over the whole buffer rather
+    # than a regex call per line; lines are still walked for the context-bound
+    # fields (price keywords, stock, status, URLs) handled by _apply_line.
+    vin_re = _ASCII_VIN_RE if cleaned.isascii() else VIN_RE
+    vin_matches = vin_re.finditer(cleaned)
+    next_vin = next(vin_matches, None)
+    if next_vin is None:
+        return []
 
-    for raw_line in cleaned.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
+    # Nothing before the line holding the first VIN can contribute to a record.
+    offset = cleaned.rfind("\n", 0, next_vin.start()) + 1
+
+    # Lowercase the buffer once and walk it in step with the original lines
+    # instead of calling lower() per line. Case folding that changes length
+    # (e.g. "\u0130") would misalign the two, so fall back to per-line lower().
+    lowered = cleaned.lower()
+    lower_lines: Iterable[Optional[str]] = (
+        lowered[offset:].splitlines(keepends=True) if len(lowered) == len(cleaned) else repeat(None)
+    )
+
+    records: Dict[str, _RowAccum] = {}
+    record: Optional[_RowAccum] = None
+    # Plain ints and local bindings keep the per-line bookkeeping off the
+    # Match-method and global lookup paths.
+    next_vin_start = next_vin.start()
+    apply_line = _apply_line
+
+    for raw_line, raw_lower in zip(cleaned[offset:].splitlines(keepends=True), lower_lines):
+        line_start = offset
+        offset += len(raw_line)
+
+        if next_vin_start < offset:
+            vin_match = next_vin
+            # Only the first VIN on a line starts a record; later ones stay text.
+            while next_vin_start < offset:
+                next_vin = next(vin_matches, None)
+                next_vin_start = next_vin.start() if next_vin is not None else len(cleaned)
 
-        vin_match = VIN_RE.search(line)
-        if vin_match:
             current_vin = vin_match.group(0).upper()
-            record = records.setdefault(
-                current_vin,
-                {
-                    "vin": current_vin,
-                    "advertised_price": None,
-                    "msrp": None,
-                    "vdp_url": None,
-                    "stock_number": None,
-                    "status": None,
-                    "image_url": None,
-                    "_price_rank": float("inf"),
-                },
-            )
-            remainder = (line[: vin_match.start()] + " " + line[vin_match.end() :]).strip()
+            record = records.get(current_vin)
+            if record is None:
+                record = records[current_vin] = _RowAccum(current_vin)
+            start = vin_match.start() - line_start
+            end = vin_match.end() - line_start
+            remainder = (raw_line[:start] + " " + raw_line[end:]).strip()
             if remainder:
-                _apply_line(record, remainder, config)
+                remainder_lower = (
+                    (raw_lower[:start] + " " + raw_lower[end:]).strip() if raw_lower is not None else None
+                )
+                apply_line(record, remainder, config, remainder_lower)
             continue
 
-        if current_vin is None:
+        if record is None:
             continue
 
-        record = records[current_vin]
-        _apply_line(record, line, config)
+        line = raw_line.strip()
+        if not line:
+            continue
 
-    rows: List[ParsedRow] = []
-    for row in records.values():
-        row.pop("_price_rank", None)
-        rows.append(row)
+        apply_line(record, line, config, raw_lower.strip() if raw_lower is not None else None)
 
-    return rows
+    return [record.as_row() for record in records.values()]
@@ -0,0 +1,82 @@
+"""Regex compilation that prefers google-re2 when it is installed.
+
+RE2 matches in linear time, which keeps the DOTALL script/section scans over
+large SRP markup predictable. It is an optional accelerator: without the
+``google-re2`` package, or for patterns RE2 cannot express (lookaround,
+``\\Z``), ``compile`` returns a stdlib pattern with the same interface.
+Note that RE2's ``\\s``, ``\\d`` and ``\\b`` are ASCII-only.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Iterator
+
+try:  # pragma: no cover - depends on the optional google-re2 wheel
+    import re2 as _re2
+except ImportError:  # pragma: no cover
+    _re2 = None
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.DOTALL, "s"), (re.MULTILINE, "m"))
+_RE2_FLAGS = re.IGNORECASE | re.DOTALL | re.MULTILINE
+
+
+def compile(pattern: str, flags: int = 0) -> Any:
+    """Compile ``pattern`` with RE2 when possible, otherwise with ``re``."""
+    if _re2 is not None and not flags & ~_RE2_FLAGS:
+        inline = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+        options = _re2.Options()
+        options.log_errors = False
+        try:
+            return _re2.compile(f"(?{inline}){pattern}" if inline else pattern, options)
+        except _re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=64)
+def _anchor_re(anchor: str) -> "re.Pattern[str]":
+    return re.compile(re.escape(anchor), re.IGNORECASE)
+
+
+def _find_anchor(text: str, anchor: str, pos: int, ignorecase: bool) -> int:
+    if not ignorecase:
+        return text.find(anchor, pos)
+    match = _anchor_re(anchor).search(text, pos)
+    return match.start() if match else -1
+
+
+def search_from_anchor(pattern: Any, text: str, anchor: str, *, ignorecase: bool = False) -> Any:
+    """``pattern.search(text)`` that skips straight to the first ``anchor``.
+
+    Every match of ``pattern`` must contain ``anchor`` with no ``>`` before it,
+    so the scan can start just after the last ``>`` preceding the first
+    occurrence, and no occurrence means no match. With ``ignorecase`` the anchor
+    is located case-insensitively, matching how the pattern itself matches.
+    """
+    index = _find_anchor(text, anchor, 0, ignorecase)
+    if index < 0:
+        return None
+    return pattern.search(text, text.rfind(">", 0, index) + 1)
+
+
+def finditer_from_anchor(pattern: Any, text: str, anchor: str, *, ignorecase: bool = False) -> Iterator[Any]:
+    """``pattern.finditer(text)`` that jumps between ``anchor`` occurrences.
+
+    Same contract as :func:`search_from_anchor`; between matches the text up to
+    the next anchor is skipped with a literal search instead of being scanned by
+    the pattern.
+    """
+    pos = 0
+    index = _find_anchor(text, anchor, 0, ignorecase)
+    while index >= 0:
+        match = pattern.search(text, max(pos, text.rfind(">", 0, index) + 1))
+        if match is None:
+            return
+        yield match
+        pos = match.end()
+        index = _find_anchor(text, anchor, pos, ignorecase)
+
+
+__all__ = ["compile", "finditer_from_anchor", "search_from_anchor"]
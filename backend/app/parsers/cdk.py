@@ -5,10 +5,10 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin, unquote
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 
-from ._inventory_common import ParserConfig, ParsedRow, parse_inventory_with_config
+from ._inventory_common import ParserConfig, ParsedRow, make_url_joiner, parse_inventory_with_config
 
 STATUS_MAP = {
     "IN TRANSIT": "in_transit",
@@ -21,6 +21,18 @@ STATUS_MAP = {
     "ON ORDER": "in_transit",
 }
 
+# Feed statuses fold "-" and "_" to spaces before a single dict lookup; the
+# extra aliases only appear in the JSON feed, not in scraped markup.
+_STATUS_SEPARATORS = str.maketrans("-_", "  ")
+_STATUS_LOOKUP = {
+    "LIVE": "available",
+    "AVAILABLE": "available",
+    "IN TRANSIT": "in_transit",
+    "ARRIVING": "in_transit",
+    "TRANSFER": "in_transit",
+    **STATUS_MAP,
+}
+
 PRICE_KEYWORDS_PRIORITY = [
     ("web price", 1),
     ("sale price", 1),
@@ -34,11 +46,11 @@ CONFIG = ParserConfig(
     price_keywords_priority=PRICE_KEYWORDS_PRIORITY,
 )
 
-CDK_FETCH_PATTERN = re.compile(
-    r'fetch\("(?P<endpoint>/api/widget/ws-inv-data/getInventory)"\s*,\s*\{.*?body:decodeURI\("(?P<payload>[^"]+)"\)'
-    r'.*?\}\)',
-    re.IGNORECASE | re.DOTALL,
-)
+CDK_INVENTORY_ENDPOINT = "/api/widget/ws-inv-data/getInventory"
+# Literal anchors for the inline fetch call; str.find avoids a DOTALL regex
+# backtracking across multi-megabyte SRPs that never contain the call.
+_CDK_FETCH_MARKER = f'fetch("{CDK_INVENTORY_ENDPOINT}"'
+_CDK_BODY_MARKER = 'body:decodeURI("'
 
 PRICE_PATTERN = re.compile(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)")
 
@@ -58,32 +70,41 @@ def extract_inventory_request(html: str) -> Optional[CDKInventoryRequest]:
     """Detect the embedded CDK inventory fetch metadata inside the SRP HTML."""
     if not html:
         return None
-    match = CDK_FETCH_PATTERN.search(html)
-    if not match:
+    fetch_at = html.find(_CDK_FETCH_MARKER)
+    if fetch_at == -1:
+        return None
+    body_at = html.find(_CDK_BODY_MARKER, fetch_at + len(_CDK_FETCH_MARKER))
+    if body_at == -1:
+        return None
+    payload_start = body_at + len(_CDK_BODY_MARKER)
+    payload_end = html.find('"', payload_start)
+    if payload_end <= payload_start or not html.startswith(")", payload_end + 1):
         return None
-    payload_raw = unquote(match.group("payload"))
+    payload_raw = unquote(html[payload_start:payload_end])
     try:
         payload = json.loads(payload_raw)
     except json.JSONDecodeError:
         return None
-    return CDKInventoryRequest(endpoint=match.group("endpoint"), payload=payload)
+    return CDKInventoryRequest(endpoint=CDK_INVENTORY_ENDPOINT, payload=payload)
 
 
 def parse_inventory_json(data: Dict[str, Any], *, base_url: str) -> List[ParsedRow]:
     """Convert the CDK inventory JSON payload into ParsedRow objects."""
     inventory = data.get("inventory") or []
     rows: List[ParsedRow] = []
+    join = make_url_joiner(base_url)
     for entry in inventory:
         vin = str(entry.get("vin") or "").upper()
         if not vin:
             continue
 
+        advertised_price, msrp = _extract_prices(entry)
         rows.append(
             {
                 "vin": vin,
-                "advertised_price": _extract_price(entry, field="final"),
-                "msrp": _extract_price(entry, field="msrp"),
-                "vdp_url": _resolve_vdp_url(entry, base_url),
+                "advertised_price": advertised_price,
+                "msrp": msrp,
+                "vdp_url": _resolve_vdp_url(entry, join),
                 "stock_number": entry.get("stockNumber") or entry.get("stock"),
                 "status": _normalize_status(entry.get("status")),
                 "image_url": _extract_image(entry),
@@ -97,34 +118,52 @@ def parse_inventory_json(data: Dict[str, Any], *, base_url: str) -> List[ParsedR
     return rows
 
 
-def _extract_price(entry: Dict[str, Any], *, field: str) -> Optional[float]:
+_FINAL_PRICE_CLASSES = frozenset({"askingPrice", "internetPrice", "finalPrice"})
+_MSRP_PRICE_CLASSES = frozenset({"msrp", "retailPrice"})
+_FINAL_PRICE_KEYS = ("salePrice", "sale_price", "askingPrice", "internetPrice", "asking_price")
+
+
+def _extract_prices(entry: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """Return the (advertised, msrp) prices from one walk over the dprice list."""
     pricing = entry.get("pricing") or {}
-    dprice = pricing.get("dprice") or []
-
-    if field == "final":
-        for item in dprice:
-            if item.get("isFinalPrice") or item.get("typeClass") in {"askingPrice", "internetPrice", "finalPrice"}:
-                price = _coerce_price(item.get("value"))
-                if price is not None:
-                    return price
-        for key in ("salePrice", "sale_price", "askingPrice", "internetPrice", "asking_price"):
-            price = _coerce_price(entry.get(key))
-            if price is not None:
-                return price
-    elif field == "msrp":
-        for item in dprice:
-            if item.get("typeClass") in {"msrp", "retailPrice"}:
-                price = _coerce_price(item.get("value"))
-                if price is not None:
-                    return price
-        price = _coerce_price(pricing.get("retailPrice"))
+    final: Optional[float] = None
+    msrp: Optional[float] = None
+
+    for item in pricing.get("dprice") or []:
+        type_class = item.get("typeClass")
+        wants_final = final is None and (item.get("isFinalPrice") or type_class in _FINAL_PRICE_CLASSES)
+        wants_msrp = msrp is None and type_class in _MSRP_PRICE_CLASSES
+        if not (wants_final or wants_msrp):
+            continue
+        price = _coerce_price(item.get("value"))
+        if price is None:
+            continue
+        if wants_final:
+            final = price
+        if wants_msrp:
+            msrp = price
+        if final is not None and msrp is not None:
+            return final, msrp
+
+    if final is None:
+        final = _first_price(entry, _FINAL_PRICE_KEYS)
+    if final is None or msrp is None:
+        fallback = _coerce_price(pricing.get("retailPrice"))
+        if fallback is None:
+            fallback = _coerce_price(entry.get("price"))
+        if final is None:
+            final = fallback
+        if msrp is None:
+            msrp = fallback
+    return final, msrp
+
+
+def _first_price(data: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[float]:
+    for key in keys:
+        price = _coerce_price(data.get(key))
         if price is not None:
             return price
-
-    price = _coerce_price(pricing.get("retailPrice"))
-    if price is not None:
-        return price
-    return _coerce_price(entry.get("price"))
+    return None
 
 
 def _coerce_price(value: Any) -> Optional[float]:
@@ -159,22 +198,12 @@ def _extract_image(entry: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _resolve_vdp_url(entry: Dict[str, Any], base_url: str) -> Optional[str]:
-    link = entry.get("link") or entry.get("vdp") or entry.get("url")
-    if not link:
-        return None
-    return urljoin(base_url, link)
+def _resolve_vdp_url(entry: Dict[str, Any], join: Callable[[Optional[str]], Optional[str]]) -> Optional[str]:
+    return join(entry.get("link") or entry.get("vdp") or entry.get("url"))
 
 
 def _normalize_status(status: Optional[str]) -> Optional[str]:
     if not status:
         return None
-    normalized = status.strip().upper().replace("-", " ").replace("_", " ")
-    for key, value in STATUS_MAP.items():
-        if key == normalized:
-            return value
-    if normalized in {"LIVE", "AVAILABLE"}:
-        return "available"
-    if normalized in {"IN TRANSIT", "ARRIVING", "TRANSFER"}:
-        return "in_transit"
-    return status.lower()
+    normalized = status.strip().upper().translate(_STATUS_SEPARATORS)
+    return _STATUS_LOOKUP.get(normalized) or status.lower()
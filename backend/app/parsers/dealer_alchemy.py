@@ -69,12 +69,18 @@ def extract_typesense_config(html: str) -> Optional[TypesenseConfig]:
     if not html:
         return None
 
+    # Bail out on the first missing credential so non-Typesense pages only pay for one scan.
     api_match = API_KEY_PATTERN.search(html)
+    if not api_match:
+        return None
     node_match = NODE_PATTERN.search(html)
+    if not node_match:
+        return None
     query_match = QUERY_BY_PATTERN.search(html)
+    if not query_match:
+        return None
     index_match = INDEX_PATTERN.search(html)
-
-    if not (api_match and node_match and query_match and index_match):
+    if not index_match:
         return None
 
     api_key = api_match.group(1).strip()
@@ -136,16 +142,20 @@ def _quote_filter_value(value: str) -> str:
     return f"'{escaped}'"
 
 
-def _normalize_vdp_url(raw: Optional[str], page_url: str, dealer_url: Optional[str]) -> Optional[str]:
+def _page_base(page_url: str) -> str:
+    parsed = urlparse(page_url)
+    if parsed.scheme and parsed.netloc:
+        return f"{parsed.scheme}://{parsed.netloc}"
+    return ""
+
+
+def _normalize_vdp_url(raw: Optional[str], page_base: str, dealer_url: Optional[str]) -> Optional[str]:
     if not raw:
         return None
-    if raw.startswith("http://") or raw.startswith("https://"):
+    if raw.startswith(("http://", "https://")):
         return raw
-    parsed = urlparse(page_url)
-    base = ""
-    if parsed.scheme and parsed.netloc:
-        base = f"{parsed.scheme}://{parsed.netloc}"
-    elif dealer_url:
+    base = page_base
+    if not base and dealer_url:
         dealer = dealer_url.strip()
         if not dealer.startswith("http"):
             dealer = f"https://{dealer.lstrip('/')}"
@@ -180,6 +190,7 @@ def parse_typesense_hits(
     """Convert Typesense search payload into ParsedRow entries."""
     results = data.get("results") or []
     rows: List[ParsedRow] = []
+    page_base = _page_base(page_url)
     for result in results:
         if not isinstance(result, dict):
             continue
@@ -193,16 +204,19 @@ def parse_typesense_hits(
             vin = str(document.get("vin") or "").upper()
             if not vin:
                 continue
-            dealer = document.get("dealer") if isinstance(document.get("dealer"), dict) else {}
-            vdp_url = _normalize_vdp_url(document.get("vdpUrl"), page_url, dealer.get("url") if isinstance(dealer, dict) else None)
+            dealer = document.get("dealer")
+            dealer_url = dealer.get("url") if isinstance(dealer, dict) else None
+            vdp_url = _normalize_vdp_url(document.get("vdpUrl"), page_base, dealer_url)
             advertised_price = (
                 _coerce_price(document.get("finalPrice"))
                 or _coerce_price(document.get("advertisedPrice"))
                 or _coerce_price(document.get("sellingPrice"))
             )
             msrp = _coerce_price(document.get("msrp"))
-            image_urls = document.get("imageUrls") if isinstance(document.get("imageUrls"), list) else []
-            features = document.get("features") if isinstance(document.get("features"), list) else None
+            image_urls = document.get("imageUrls")
+            features = document.get("features")
+            if not isinstance(features, list):
+                features = None
             rows.append(
                 {
                     "vin": vin,
@@ -211,7 +225,7 @@ def parse_typesense_hits(
                     "vdp_url": vdp_url,
                     "stock_number": document.get("stockNumber"),
                     "status": _derive_status(document),
-                    "image_url": image_urls[0] if image_urls else None,
+                    "image_url": image_urls[0] if isinstance(image_urls, list) and image_urls else None,
                     "make": document.get("make"),
                     "model": document.get("model"),
                     "year": document.get("year"),
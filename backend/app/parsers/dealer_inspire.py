@@ -5,10 +5,9 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from ._inventory_common import ParserConfig, ParsedRow, parse_inventory_with_config
+from ._inventory_common import ParserConfig, ParsedRow, make_url_joiner, parse_inventory_with_config
 
 STATUS_MAP = {
     "IN TRANSIT": "in_transit",
@@ -45,7 +44,7 @@ class AlgoliaConfig:
     app_id: str
     api_key: str
     index: str
-    refinements: Dict[str, List[str]] = field(default_factory=dict)
+    refinements: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
 
 
 def extract_algolia_config(html: str) -> Optional[AlgoliaConfig]:
@@ -57,7 +56,7 @@ def extract_algolia_config(html: str) -> Optional[AlgoliaConfig]:
     app_id: Optional[str] = None
     api_key: Optional[str] = None
     index: Optional[str] = None
-    refinements: Dict[str, List[str]] = {}
+    refinements: Dict[str, Tuple[str, ...]] = {}
 
     if settings:
         app_id = settings.get("appId")
@@ -66,7 +65,7 @@ def extract_algolia_config(html: str) -> Optional[AlgoliaConfig]:
         raw_refinements = settings.get("refinements") or {}
         if isinstance(raw_refinements, dict):
             refinements = {
-                key: list(value) if isinstance(value, (list, tuple)) else [str(value)]
+                key: tuple(value) if isinstance(value, (list, tuple)) else (str(value),)
                 for key, value in raw_refinements.items()
             }
 
@@ -101,26 +100,20 @@ def build_algolia_params(
         return text
 
     filters: List[str] = []
+    seen: Set[str] = set()
     for key, values in config.refinements.items():
-        if not values:
-            continue
         for value in values:
             quoted = quote(value)
             if quoted:
                 filters.append(f"{key}:{quoted}")
+                seen.add(key)
 
-    if not any(f.startswith("model:") for f in filters):
-        quoted_model = quote(model)
-        if quoted_model:
-            filters.append(f"model:{quoted_model}")
-    if make and not any(f.startswith("make:") for f in filters):
-        quoted_make = quote(make)
-        if quoted_make:
-            filters.append(f"make:{quoted_make}")
-    if inventory_type and not any(f.startswith("type:") for f in filters):
-        quoted_type = quote(inventory_type)
-        if quoted_type:
-            filters.append(f"type:{quoted_type}")
+    for key, value in (("model", model), ("make", make), ("type", inventory_type)):
+        if key in seen:
+            continue
+        quoted = quote(value)
+        if quoted:
+            filters.append(f"{key}:{quoted}")
 
     filter_str = " AND ".join(filters)
     params = f"hitsPerPage={hits_per_page}"
@@ -133,6 +126,7 @@ def parse_algolia_hits(data: Dict[str, Any], *, base_url: str) -> List[ParsedRow
     """Convert Algolia search results into inventory rows."""
     hits = data.get("hits") or []
     rows: List[ParsedRow] = []
+    join = make_url_joiner(base_url)
     for hit in hits:
         vin = str(hit.get("vin") or "").upper()
         if not vin:
@@ -140,14 +134,12 @@ def parse_algolia_hits(data: Dict[str, Any], *, base_url: str) -> List[ParsedRow
         rows.append(
             {
                 "vin": vin,
-                "advertised_price": _coerce_price(
-                    hit.get("our_price") or hit.get("algoliaPrice") or hit.get("price")
-                ),
+                "advertised_price": _coerce_price(_first_not_none(hit, _HIT_PRICE_KEYS)),
                 "msrp": _coerce_price(hit.get("msrp")),
-                "vdp_url": _normalize_link(hit.get("link"), base_url),
+                "vdp_url": join(hit.get("link")),
                 "stock_number": hit.get("stock"),
                 "status": _normalize_status(hit.get("vehicle_status") or hit.get("status")),
-                "image_url": _extract_image(hit, base_url),
+                "image_url": _extract_image(hit, join),
                 "make": hit.get("make"),
                 "model": hit.get("model"),
                 "year": hit.get("year"),
@@ -158,6 +150,9 @@ def parse_algolia_hits(data: Dict[str, Any], *, base_url: str) -> List[ParsedRow
     return rows
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
 def _extract_inventory_lightning_settings(html: str) -> Optional[Dict[str, Any]]:
     marker = "var inventoryLightningSettings"
     start = html.find(marker)
@@ -166,23 +161,19 @@ def _extract_inventory_lightning_settings(html: str) -> Optional[Dict[str, Any]]
     brace_start = html.find("{", start)
     if brace_start == -1:
         return None
-    depth = 0
-    for idx in range(brace_start, len(html)):
-        char = html[idx]
-        if char == "{":
-            depth += 1
-        elif char == "}":
-            depth -= 1
-            if depth == 0:
-                snippet = html[brace_start : idx + 1]
-                try:
-                    return json.loads(snippet)
-                except json.JSONDecodeError:
-                    return None
-    return None
+    # raw_decode finds the end of the object itself, braces inside strings included.
+    try:
+        settings, _ = _JSON_DECODER.raw_decode(html, brace_start)
+    except json.JSONDecodeError:
+        return None
+    return settings if isinstance(settings, dict) else None
 
 
 ALGOLIA_HELPER_PATTERN = re.compile(r'<div[^>]+id=["\']sb-algolia-helper["\'][^>]*>', re.IGNORECASE)
+_HELPER_ATTR_RES = {
+    attribute: re.compile(rf'{attribute}="([^"]+)"', re.IGNORECASE)
+    for attribute in ("data-app-id", "data-search-key", "data-index")
+}
 
 
 def _extract_algolia_helper(html: str) -> Optional[Dict[str, str]]:
@@ -191,19 +182,13 @@ def _extract_algolia_helper(html: str) -> Optional[Dict[str, str]]:
         return None
     tag = match.group(0)
     attrs = {}
-    for attribute in ("data-app-id", "data-search-key", "data-index"):
-        attr_match = re.search(fr'{attribute}="([^"]+)"', tag, flags=re.IGNORECASE)
+    for attribute, pattern in _HELPER_ATTR_RES.items():
+        attr_match = pattern.search(tag)
         if attr_match:
             attrs[attribute] = attr_match.group(1)
     return attrs or None
 
 
-def _normalize_link(link: Optional[str], base_url: str) -> Optional[str]:
-    if not link:
-        return None
-    return urljoin(base_url, link)
-
-
 def _coerce_price(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -219,15 +204,28 @@ def _coerce_price(value: Any) -> Optional[float]:
         return None
 
 
-def _extract_image(hit: Dict[str, Any], base_url: str) -> Optional[str]:
+_HIT_PRICE_KEYS = ("our_price", "algoliaPrice", "price")
+
+
+def _first_not_none(hit: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    # The first key present wins even when falsy: a real 0 is a price, and a
+    # "Call for price" placeholder must not fall through to algoliaPrice's "0".
+    for key in keys:
+        value = hit.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _extract_image(hit: Dict[str, Any], join: Callable[[Optional[str]], Optional[str]]) -> Optional[str]:
     thumbnail = hit.get("thumbnail")
     if thumbnail:
-        return _normalize_link(thumbnail, base_url)
+        return join(thumbnail)
     images = hit.get("images") or []
     for image in images:
         uri = image.get("url") or image.get("src")
         if uri:
-            return _normalize_link(uri, base_url)
+            return join(uri)
     return None
 
 
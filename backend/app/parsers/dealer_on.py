@@ -2,49 +2,112 @@
 
 from __future__ import annotations
 
-import json
+import atexit
 import re
 from html import unescape
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qsl, urlparse
 
 import httpx
-
-from ._inventory_common import ParsedRow
-
-TAGGING_DATA_SCRIPT_RE = re.compile(
-    r'<script[^>]+id="dealeron_tagging_data"[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+import orjson
+
+from . import _re
+from ._http import LoopLocalAsyncClient
+from ._inventory_common import ParsedRow, parse_currency
+
+# One pass over the markup picks up the tagging script and both URL hints.
+_MARKUP_RE = _re.compile(
+    r'<script[^>]+id="dealeron_tagging_data"[^>]*>(?P<tagging>.*?)</script>'
+    r'|<meta[^>]+property="og:url"[^>]+content="(?P<og_url>[^"]+)"'
+    r'|<link[^>]+rel="canonical"[^>]+href="(?P<canonical>[^"]+)"',
+    re.DOTALL | re.IGNORECASE,
 )
-OG_URL_META_RE = re.compile(r'<meta[^>]+property="og:url"[^>]+content="([^"]+)"', re.IGNORECASE)
-CANONICAL_LINK_RE = re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', re.IGNORECASE)
+# Literal text inside each _MARKUP_RE alternative, used to skip the page head.
+_MARKUP_ANCHORS = ("dealeron_tagging_data", 'property="og:url"', 'rel="canonical"')
+
+# Tagging ``items`` as a flat array of escape-free strings (VINs).
+_ITEMS_RE = re.compile(r'"items"\s*:\s*\[(?P<items>\s*(?:"[^"\\]*"\s*(?:,\s*"[^"\\]*"\s*)*)?)\]')
+# JSON string literals, stripped before counting brackets to find nesting depth.
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
 
 API_TIMEOUT_SECONDS = 10.0
 
+# Shared keep-alive pool so consecutive dealer pages on the Cosmos backend
+# reuse connections instead of paying a TCP/TLS handshake per parse.
+_CLIENT = httpx.Client(
+    timeout=API_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+atexit.register(_CLIENT.close)
+_ASYNC_CLIENT = LoopLocalAsyncClient(
+    timeout=API_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+
 
 class DealerOnParseError(RuntimeError):
     """Raised when DealerOn markup cannot be parsed into configuration."""
 
 
-def _extract_tagging_data(raw_html: str) -> Dict[str, Any]:
-    match = TAGGING_DATA_SCRIPT_RE.search(raw_html)
-    if not match:
-        return {}
-    try:
-        return json.loads(match.group(1))
-    except json.JSONDecodeError:
-        return {}
+def _scan_markup(raw_html: str) -> Dict[str, str]:
+    """Return the first tagging script, og:url and canonical href found."""
+    found: Dict[str, str] = {}
+    for match in _MARKUP_RE.finditer(raw_html, _markup_scan_start(raw_html)):
+        kind = match.lastgroup
+        if kind not in found:
+            found[kind] = match.group(kind)
+            # canonical is only a fallback for og:url, so stop once these two are known.
+            if "tagging" in found and "og_url" in found:
+                break
+    return found
+
+
+def _markup_scan_start(raw_html: str) -> int:
+    """Offset of the first tag that can hold a markup anchor, or 0 to scan everything.
+
+    The pattern ignores case, so unless every anchor is present as spelled the
+    scan starts from the top to keep differently-cased markup working.
+    """
+    start = len(raw_html)
+    for anchor in _MARKUP_ANCHORS:
+        index = raw_html.find(anchor)
+        if index < 0:
+            return 0
+        start = min(start, raw_html.rfind(">", 0, index) + 1)
+    return start
 
 
-def _extract_host_and_query(raw_html: str) -> Tuple[Optional[str], str]:
-    og_match = OG_URL_META_RE.search(raw_html)
-    canonical_match = CANONICAL_LINK_RE.search(raw_html)
+def _depth_at(script: str, pos: int) -> int:
+    """Return the bracket nesting depth of ``script`` at ``pos`` (-1 inside a string)."""
+    prefix = _JSON_STRING_RE.sub("", script[:pos])
+    if '"' in prefix:
+        return -1
+    return prefix.count("{") + prefix.count("[") - prefix.count("}") - prefix.count("]")
 
-    candidate_url = None
-    if og_match:
-        candidate_url = og_match.group(1)
-    elif canonical_match:
-        candidate_url = canonical_match.group(1)
 
+def _parse_tagging_data(script: Optional[str]) -> Tuple[Dict[str, Any], Optional[int]]:
+    """Decode the tagging script, returning it with the number of listed items.
+
+    ``items`` is only needed for its length, so a top-level flat list of plain
+    strings is counted in the raw text and replaced with ``null`` before decoding.
+    Nested ``items`` keys are left alone.
+    """
+    if not script:
+        return {}, None
+    item_count: Optional[int] = None
+    for match in _ITEMS_RE.finditer(script):
+        if _depth_at(script, match.start()) != 1:
+            continue
+        item_count = match.group("items").count('"') // 2
+        script = f'{script[:match.start()]}"items":null{script[match.end():]}'
+        break
+    try:
+        return orjson.loads(script), item_count
+    except orjson.JSONDecodeError:
+        return {}, None
+
+
+def _parse_host_and_query(candidate_url: Optional[str]) -> Tuple[Optional[str], str]:
     if not candidate_url:
         return None, ""
 
@@ -60,22 +123,15 @@ def _extract_host_and_query(raw_html: str) -> Tuple[Optional[str], str]:
 
 
 def _fetch_inventory_json(url: str, params: Dict[str, str]) -> Dict[str, Any]:
-    with httpx.Client(timeout=API_TIMEOUT_SECONDS) as client:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+    response = _CLIENT.get(url, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
-def _normalize_price(value: Optional[Any]) -> Optional[float]:
-    if value in (None, ""):
-        return None
-    try:
-        numeric = float(value)
-    except (TypeError, ValueError):
-        return None
-    if numeric <= 0:
-        return None
-    return numeric
+async def _fetch_inventory_json_async(url: str, params: Dict[str, str]) -> Dict[str, Any]:
+    response = await _ASYNC_CLIENT.get().get(url, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
 def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
@@ -94,7 +150,40 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     if not markdown_or_html:
         return []
 
-    tagging_data = _extract_tagging_data(markdown_or_html)
+    request = _prepare_request(markdown_or_html)
+    if request is None:
+        return []
+    api_url, params, host = request
+    try:
+        # Keep only the cards so the rest of the decoded payload is freed before rows are built.
+        display_cards = _fetch_inventory_json(api_url, params).get("DisplayCards")
+    except httpx.HTTPError as exc:
+        raise DealerOnParseError(f"DealerOn API request failed: {exc}") from exc
+    return _build_rows(display_cards, host)
+
+
+async def parse_inventory_async(markdown_or_html: str) -> List[ParsedRow]:
+    """Async variant of :func:`parse_inventory` that does not block the event loop."""
+
+    if not markdown_or_html:
+        return []
+
+    request = _prepare_request(markdown_or_html)
+    if request is None:
+        return []
+    api_url, params, host = request
+    try:
+        # Keep only the cards so the rest of the decoded payload is freed before rows are built.
+        display_cards = (await _fetch_inventory_json_async(api_url, params)).get("DisplayCards")
+    except httpx.HTTPError as exc:
+        raise DealerOnParseError(f"DealerOn API request failed: {exc}") from exc
+    return _build_rows(display_cards, host)
+
+
+def _prepare_request(markdown_or_html: str) -> Optional[Tuple[str, Dict[str, str], str]]:
+    """Return the Cosmos API URL, query params and dealer host, or None for an empty SRP."""
+    markup = _scan_markup(markdown_or_html)
+    tagging_data, item_count = _parse_tagging_data(markup.get("tagging"))
     if not tagging_data:
         raise DealerOnParseError("Unable to locate dealeron_tagging_data script in markup.")
 
@@ -109,20 +198,19 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     except ValueError as exc:
         raise DealerOnParseError("dealerId or pageId is not numeric.") from exc
 
-    host, query_string = _extract_host_and_query(markdown_or_html)
+    host, query_string = _parse_host_and_query(markup.get("og_url") or markup.get("canonical"))
     if not host:
         raise DealerOnParseError("Unable to determine host for DealerOn page from markup.")
 
     status_code = tagging_data.get("statusCode")
     if status_code == 404:
         # DealerOn returns 404 with empty items when the filtered SRP has no inventory.
-        return []
+        return None
 
     vin_items = tagging_data.get("items")
     if isinstance(vin_items, list):
-        page_size = max(len(vin_items), 12)
-    else:
-        page_size = 12
+        item_count = len(vin_items)
+    page_size = max(item_count or 0, 12)
 
     params: Dict[str, str] = {
         "host": host,
@@ -135,13 +223,11 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
             params[key] = value
 
     api_url = f"https://{host}/api/vhcliaa/vehicle-pages/cosmos/srp/vehicles/{dealer_id}/{page_id}"
-    try:
-        payload = _fetch_inventory_json(api_url, params)
-    except httpx.HTTPError as exc:
-        raise DealerOnParseError(f"DealerOn API request failed: {exc}") from exc
+    return api_url, params, host
+
 
+def _build_rows(display_cards: Any, host: str) -> List[ParsedRow]:
     rows: List[ParsedRow] = []
-    display_cards = payload.get("DisplayCards")
     if not isinstance(display_cards, list):
         return rows
 
@@ -165,11 +251,11 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
         if isinstance(vdp_url, str) and not vdp_url.startswith("http"):
             vdp_url = f"https://{host}{vdp_url}"
 
-        advertised_price = _normalize_price(vehicle_card.get("VehicleInternetPrice"))
+        advertised_price = parse_currency(vehicle_card.get("VehicleInternetPrice"))
         if advertised_price is None:
-            advertised_price = _normalize_price(vehicle_card.get("TaggingPrice"))
+            advertised_price = parse_currency(vehicle_card.get("TaggingPrice"))
 
-        msrp = _normalize_price(vehicle_card.get("VehicleMsrp"))
+        msrp = parse_currency(vehicle_card.get("VehicleMsrp"))
 
         status = "available"
         if vehicle_card.get("VehicleInTransit") or vehicle_card.get("VehicleInProduction"):
@@ -193,4 +279,4 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     return rows
 
 
-__all__ = ["parse_inventory", "DealerOnParseError"]
+__all__ = ["parse_inventory", "parse_inventory_async", "DealerOnParseError"]
@@ -5,23 +5,33 @@ from __future__ import annotations
 import re
 from typing import Dict, List, Optional
 
+from . import _re
 from ._inventory_common import ParsedRow
 
-HEADER_PATTERN = re.compile(r"## \[.*?\]\((?P<vdp>[^)]+)\).*?\n", re.DOTALL)
-SECTION_PATTERN = re.compile(
+HEADER_PATTERN = _re.compile(r"## \[.*?\]\((?P<vdp>[^)]+)\).*?\n", re.DOTALL)
+SECTION_PATTERN = _re.compile(
     r"## \[.*?\]\((?P<vdp>[^)]+)\).*?\n(?P<body>.*?)(?=\n## \[|\Z)",
     re.DOTALL,
 )
-VIN_PATTERN = re.compile(r"\|\s*VIN\s*\|\s*([A-HJ-NPR-Z0-9]{17})\s*\|")
-TABLE_FIELD_PATTERN = re.compile(r"\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|")
-PRICE_PATTERN = re.compile(r"Your Price\s*\n\$(\d[\d,]*)")
-MSRP_PATTERN = re.compile(r"(?:MSRP|TSRP)\s*\n\$(\d[\d,]*)")
+VIN_PATTERN = _re.compile(r"\|\s*VIN\s*\|\s*([A-HJ-NPR-Z0-9]{17})\s*\|")
+TABLE_FIELD_PATTERN = _re.compile(r"\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|")
+PRICE_PATTERN = _re.compile(r"Your Price\s*\n\$(\d[\d,]*)")
+MSRP_PATTERN = _re.compile(r"(?:MSRP|TSRP)\s*\n\$(\d[\d,]*)")
+
+
+# The only table cells parse_inventory reads.
+_TABLE_FIELDS = frozenset(("stock #", "trim", "model"))
 
 
 def _parse_table(body: str) -> Dict[str, str]:
+    # TABLE_FIELD_PATTERN already trims around non-blank cells, so labels only
+    # need lowercasing; values are stripped just for the fields kept. Later
+    # duplicates still win, as before.
     table: Dict[str, str] = {}
     for label, value in TABLE_FIELD_PATTERN.findall(body):
-        table[label.strip().lower()] = value.strip()
+        key = label.lower()
+        if key in _TABLE_FIELDS:
+            table[key] = value.strip()
     return table
 
 
@@ -2,38 +2,55 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import re
 from html import unescape
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import parse_qs, urlparse, unquote
+from urllib.parse import ParseResult, parse_qs, urlparse, unquote
 
 import httpx
+import orjson
 
-from ._inventory_common import ParsedRow
+from . import _re
+from ._http import LoopLocalAsyncClient
+from ._inventory_common import ParsedRow, parse_currency
 
 TYPENSE_TIMEOUT_SECONDS = 10.0
 
+# Shared keep-alive pool for Typesense lookups; see dealer_on._CLIENT.
+_TS_CLIENT = httpx.Client(
+    timeout=TYPENSE_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+atexit.register(_TS_CLIENT.close)
+_ASYNC_TS_CLIENT = LoopLocalAsyncClient(
+    timeout=TYPENSE_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+
 
 class SmartPathParseError(RuntimeError):
     """Raised when SmartPath markup is missing required configuration."""
 
 
-_API_KEY_RE = re.compile(r"apiKey:\s*['\"]([^'\"]+)['\"]")
-_HOST_RE = re.compile(r"host:\s*['\"]([^'\"]+)['\"]")
-_INDEX_RE = re.compile(r"var\s+indexName\s*=\s*['\"]([^'\"]+)['\"]")
-_DEALER_CD_RE = re.compile(r"dealerCd['\"]?\s*[:=]\s*['\"](\d+)['\"]")
-_CANONICAL_RE = re.compile(r"<link[^>]+rel=\"canonical\"[^>]+href=\"([^\"]+)\"", re.IGNORECASE)
-_OG_URL_RE = re.compile(r"<meta[^>]+property=\"og:url\"[^>]+content=\"([^\"]+)\"", re.IGNORECASE)
+_API_KEY_RE = _re.compile(r"apiKey:\s*['\"]([^'\"]+)['\"]")
+_HOST_RE = _re.compile(r"host:\s*['\"]([^'\"]+)['\"]")
+_INDEX_RE = _re.compile(r"var\s+indexName\s*=\s*['\"]([^'\"]+)['\"]")
+_DEALER_CD_RE = _re.compile(r"dealerCd['\"]?\s*[:=]\s*['\"](\d+)['\"]")
+_CANONICAL_RE = _re.compile(r"<link[^>]+rel=\"canonical\"[^>]+href=\"([^\"]+)\"", re.IGNORECASE)
+_OG_URL_RE = _re.compile(r"<meta[^>]+property=\"og:url\"[^>]+content=\"([^\"]+)\"", re.IGNORECASE)
+_FALLBACK_INDEX_RE = _re.compile(r"vehicles-[A-Za-z0-9]+")
+_URL_HINTS = ((_CANONICAL_RE, 'rel="canonical"'), (_OG_URL_RE, 'property="og:url"'))
 
 
 def _parse_typesense_config(raw_html: str) -> Tuple[str, str, str]:
-    api_key_match = _API_KEY_RE.search(raw_html)
-    host_match = _HOST_RE.search(raw_html)
-    index_match = _INDEX_RE.search(raw_html)
+    api_key_match = _re.search_from_anchor(_API_KEY_RE, raw_html, "apiKey")
+    host_match = _re.search_from_anchor(_HOST_RE, raw_html, "host:")
+    index_match = _re.search_from_anchor(_INDEX_RE, raw_html, "indexName")
 
     if not index_match:
-        fallback_index = re.search(r"vehicles-[A-Za-z0-9]+", raw_html)
+        fallback_index = _re.search_from_anchor(_FALLBACK_INDEX_RE, raw_html, "vehicles-")
         if fallback_index:
             index_name = fallback_index.group(0)
         else:
@@ -49,25 +66,26 @@ def _parse_typesense_config(raw_html: str) -> Tuple[str, str, str]:
     return api_key, host, index_name
 
 
-def _extract_dealer_host(raw_html: str) -> Optional[str]:
-    for pattern in (_CANONICAL_RE, _OG_URL_RE):
-        match = pattern.search(raw_html)
+def _discover_urls(raw_html: str) -> List[ParseResult]:
+    """Parse the canonical and og:url hints (in that order) once for both extractors."""
+    urls: List[ParseResult] = []
+    for pattern, anchor in _URL_HINTS:
+        match = _re.search_from_anchor(pattern, raw_html, anchor, ignorecase=True)
         if match:
-            url = unescape(match.group(1))
-            parsed = urlparse(url)
-            if parsed.netloc:
-                return parsed.netloc
+            urls.append(urlparse(unescape(match.group(1))))
+    return urls
+
+
+def _extract_dealer_host(urls: List[ParseResult]) -> Optional[str]:
+    for parsed in urls:
+        if parsed.netloc:
+            return parsed.netloc
     return None
 
 
-def _extract_model_filter(raw_html: str) -> Optional[str]:
+def _extract_model_filter(urls: List[ParseResult]) -> Optional[str]:
     candidates: List[str] = []
-    for pattern in (_CANONICAL_RE, _OG_URL_RE):
-        match = pattern.search(raw_html)
-        if not match:
-            continue
-        url = unescape(match.group(1))
-        parsed = urlparse(url)
+    for parsed in urls:
         if parsed.query:
             params = parse_qs(parsed.query)
             if "model" in params:
@@ -88,27 +106,32 @@ def _extract_model_filter(raw_html: str) -> Optional[str]:
     return None
 
 
+_MODEL_LOOKUP = {
+    "4runner": "4Runner",
+    "4 runner": "4Runner",
+    "tacoma": "Tacoma",
+    "tundra": "Tundra",
+    "land cruiser": "Land Cruiser",
+    "land-cruiser": "Land Cruiser",
+}
+
+
 def _normalize_model(value: str) -> Optional[str]:
     if not value:
         return None
-    decoded = unquote(value).replace("+", " ").strip().lower()
-    mapping = {
-        "4runner": "4Runner",
-        "4 runner": "4Runner",
-        "tacoma": "Tacoma",
-        "tundra": "Tundra",
-        "land cruiser": "Land Cruiser",
-        "land-cruiser": "Land Cruiser",
-    }
-    return mapping.get(decoded)
+    # Canonical segments need no decoding, so try them before unquote/replace/strip.
+    model = _MODEL_LOOKUP.get(value.lower())
+    if model is not None:
+        return model
+    decoded = unquote(value) if "%" in value else value
+    return _MODEL_LOOKUP.get(decoded.replace("+", " ").strip().lower())
 
 
-def _fetch_typesense_documents(
+def _typesense_request(
     base_url: str,
-    api_key: str,
     index_name: str,
     model_filter: Optional[str],
-) -> List[Dict[str, object]]:
+) -> Tuple[str, Dict[str, object]]:
     filters = ["condition:='New'"]
     if model_filter:
         filters.append(f"model:='{model_filter}'")
@@ -121,43 +144,74 @@ def _fetch_typesense_documents(
     }
 
     url = f"{base_url}/collections/{index_name}/documents/search"
-    headers = {"x-typesense-api-key": api_key}
-    response = httpx.get(url, params=params, headers=headers, timeout=TYPENSE_TIMEOUT_SECONDS)
-    response.raise_for_status()
-    payload = response.json()
+    return url, params
+
+
+def _documents_from_payload(payload: Dict[str, object]) -> List[Dict[str, object]]:
     hits = payload.get("hits")
     if not isinstance(hits, list):
         return []
     return [hit.get("document", {}) for hit in hits if isinstance(hit, dict)]
 
 
-def _parse_currency(value: Optional[str]) -> Optional[float]:
-    if not isinstance(value, str):
-        return None
-    stripped = value.replace("$", "").replace(",", "").strip()
-    try:
-        numeric = float(stripped)
-    except ValueError:
-        return None
-    if numeric <= 0:
-        return None
-    return numeric
+def _fetch_typesense_documents(
+    base_url: str,
+    api_key: str,
+    index_name: str,
+    model_filter: Optional[str],
+) -> List[Dict[str, object]]:
+    url, params = _typesense_request(base_url, index_name, model_filter)
+    headers = {"x-typesense-api-key": api_key}
+    response = _TS_CLIENT.get(url, params=params, headers=headers)
+    response.raise_for_status()
+    return _documents_from_payload(orjson.loads(response.content))
+
+
+async def _fetch_typesense_documents_async(
+    base_url: str,
+    api_key: str,
+    index_name: str,
+    model_filter: Optional[str],
+) -> List[Dict[str, object]]:
+    url, params = _typesense_request(base_url, index_name, model_filter)
+    headers = {"x-typesense-api-key": api_key}
+    response = await _ASYNC_TS_CLIENT.get().get(url, params=params, headers=headers)
+    response.raise_for_status()
+    return _documents_from_payload(orjson.loads(response.content))
 
 
 def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     if not markdown_or_html:
         return []
 
+    typesense_base, api_key, index_name, model_filter, dealer_host = _prepare_request(markdown_or_html)
+    documents = _fetch_typesense_documents(typesense_base, api_key, index_name, model_filter)
+    return _build_rows(documents, dealer_host)
+
+
+async def parse_inventory_async(markdown_or_html: str) -> List[ParsedRow]:
+    """Async variant of :func:`parse_inventory` that does not block the event loop."""
+    if not markdown_or_html:
+        return []
+
+    typesense_base, api_key, index_name, model_filter, dealer_host = _prepare_request(markdown_or_html)
+    documents = await _fetch_typesense_documents_async(typesense_base, api_key, index_name, model_filter)
+    return _build_rows(documents, dealer_host)
+
+
+def _prepare_request(markdown_or_html: str) -> Tuple[str, str, str, Optional[str], str]:
     api_key, typesense_host, index_name = _parse_typesense_config(markdown_or_html)
-    model_filter = _extract_model_filter(markdown_or_html)
-    dealer_host = _extract_dealer_host(markdown_or_html)
+    urls = _discover_urls(markdown_or_html)
+    model_filter = _extract_model_filter(urls)
+    dealer_host = _extract_dealer_host(urls)
 
     if not dealer_host:
         raise SmartPathParseError("Unable to determine dealer host for SmartPath site.")
 
-    typesense_base = f"https://{typesense_host}"
-    documents = _fetch_typesense_documents(typesense_base, api_key, index_name, model_filter)
+    return f"https://{typesense_host}", api_key, index_name, model_filter, dealer_host
+
 
+def _build_rows(documents: List[Dict[str, object]], dealer_host: str) -> List[ParsedRow]:
     rows: List[ParsedRow] = []
     for doc in documents:
         if not isinstance(doc, dict):
@@ -167,31 +221,39 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
             continue
         vin = vin.upper()
 
-        final_price = _parse_currency(doc.get("finalPrice") or doc.get("sellingPrice") or doc.get("price"))
-        advertised_price = final_price or _parse_currency(doc.get("internetPrice"))
-        msrp = _parse_currency(doc.get("msrp")) or _parse_currency(doc.get("price"))
+        list_price = doc.get("price")
+        final_price = parse_currency(doc.get("finalPrice") or doc.get("sellingPrice") or list_price)
+        advertised_price = final_price or parse_currency(doc.get("internetPrice"))
+        msrp = parse_currency(doc.get("msrp")) or parse_currency(list_price)
 
-        flags = doc.get("flags") if isinstance(doc.get("flags"), dict) else {}
+        flags = doc.get("flags")
         status = "in_transit" if isinstance(flags, dict) and flags.get("inTransit") else "available"
 
         images = doc.get("imageUrls")
         image_url = images[0] if isinstance(images, list) and images else None
 
-        vdp_url = doc.get("vdpUrl") if isinstance(doc.get("vdpUrl"), str) else None
-        if vdp_url and vdp_url.startswith("/"):
+        vdp_url = doc.get("vdpUrl")
+        if not isinstance(vdp_url, str):
+            vdp_url = None
+        elif vdp_url.startswith("/"):
             vdp_url = f"https://{dealer_host}{vdp_url}"
 
+        stock_number = doc.get("stockNumber")
+        trim = doc.get("trim")
+        model = doc.get("model")
+        year = doc.get("year")
+        features = doc.get("features")
         row: ParsedRow = {
             "vin": vin,
             "advertised_price": advertised_price,
             "msrp": msrp,
             "vdp_url": vdp_url,
-            "stock_number": doc.get("stockNumber") if isinstance(doc.get("stockNumber"), str) else None,
+            "stock_number": stock_number if isinstance(stock_number, str) else None,
             "status": status,
-            "trim": doc.get("trim") if isinstance(doc.get("trim"), str) else None,
-            "model": doc.get("model") if isinstance(doc.get("model"), str) else None,
-            "year": doc.get("year") if isinstance(doc.get("year"), (int, float, str)) else None,
-            "features": doc.get("features") if isinstance(doc.get("features"), list) else None,
+            "trim": trim if isinstance(trim, str) else None,
+            "model": model if isinstance(model, str) else None,
+            "year": year if isinstance(year, (int, float, str)) else None,
+            "features": features if isinstance(features, list) else None,
             "image_url": image_url,
         }
         rows.append(row)
@@ -199,4 +261,4 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     return rows
 
 
-__all__ = ["parse_inventory", "SmartPathParseError"]
+__all__ = ["parse_inventory", "parse_inventory_async", "SmartPathParseError"]
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
-import json
 import re
 from html import unescape
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
-from ._inventory_common import ParsedRow
+import orjson
 
-LD_JSON_RE = re.compile(r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+from . import _re
+from ._inventory_common import ParsedRow, parse_currency
+
+LD_JSON_RE = _re.compile(r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+_LD_JSON_ANCHOR = 'type="application/ld+json"'
+_CANONICAL_RE = _re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', re.IGNORECASE)
 
 
 class TeamVelocityParseError(RuntimeError):
@@ -18,7 +22,7 @@ class TeamVelocityParseError(RuntimeError):
 
 
 def _extract_dealer_host(raw_html: str) -> Optional[str]:
-    match = re.search(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', raw_html, re.IGNORECASE)
+    match = _CANONICAL_RE.search(raw_html)
     if not match:
         return None
     url = unescape(match.group(1))
@@ -28,10 +32,14 @@ def _extract_dealer_host(raw_html: str) -> Optional[str]:
 
 def _iter_cars(raw_html: str) -> List[Dict[str, object]]:
     cars: List[Dict[str, object]] = []
-    for script in LD_JSON_RE.findall(raw_html):
+    for match in _re.finditer_from_anchor(LD_JSON_RE, raw_html, _LD_JSON_ANCHOR, ignorecase=True):
+        script = match.group(1)
+        # Breadcrumb/AutoDealer blocks never mention "Car"; skip decoding them.
+        if '"Car"' not in script:
+            continue
         try:
-            payload = json.loads(script)
-        except json.JSONDecodeError:
+            payload = orjson.loads(script)
+        except orjson.JSONDecodeError:
             continue
         nodes: List[Dict[str, object]] = []
         if isinstance(payload, dict):
@@ -44,21 +52,6 @@ def _iter_cars(raw_html: str) -> List[Dict[str, object]]:
     return cars
 
 
-def _parse_price(value: Optional[str]) -> Optional[float]:
-    if not isinstance(value, str):
-        return None
-    stripped = value.replace("$", "").replace(",", "").strip()
-    if not stripped:
-        return None
-    try:
-        numeric = float(stripped)
-    except ValueError:
-        return None
-    if numeric <= 0:
-        return None
-    return numeric
-
-
 def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
     if not markdown_or_html:
         return []
@@ -77,7 +70,7 @@ def parse_inventory(markdown_or_html: str) -> List[ParsedRow]:
 
         offers = car.get("offers")
         offer = offers if isinstance(offers, dict) else None
-        price = _parse_price(offer.get("price")) if offer else None
+        price = parse_currency(offer.get("price")) if offer else None
 
         image_obj = car.get("image")
         image_url: Optional[str] = None
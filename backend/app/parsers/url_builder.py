@@ -1,14 +1,27 @@
 from __future__ import annotations
 
-import json
+import os
 import re
+import tempfile
 import unicodedata
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from urllib.parse import urljoin
 
+import orjson
 import yaml
 
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[-\s]+")
+_EMPTY_CITY_CODE_RE = re.compile(r"([?&])cy=(?:(?=&)|$)")
+_EMPTY_CITY_CODE_PARAM_RE = re.compile(r"([?&])cy=(?:&|$)")
+_AMPERSAND_RUN_RE = re.compile(r"&&+")
+
+
+def _drop_city_code(match: re.Match[str]) -> str:
+    return "?" if match.group(1) == "?" else ""
+
 
 def _slugify(value: Any) -> str | None:
     if value is None:
@@ -18,14 +31,49 @@ def _slugify(value: Any) -> str | None:
         return None
     normalized = unicodedata.normalize("NFKD", text)
     ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
-    ascii_text = re.sub(r"[^\w\s-]", "", ascii_text).strip().lower()
-    slug = re.sub(r"[-\s]+", "-", ascii_text)
+    ascii_text = _SLUG_STRIP_RE.sub("", ascii_text).strip().lower()
+    slug = _SLUG_SEPARATOR_RE.sub("-", ascii_text)
     return slug or None
 
 
+def _read_models_data(models_path: Path) -> Dict[str, Any]:
+    """Load models.yaml, preferring a JSON sidecar built from the same file.
+
+    The sidecar (data/models.json, not tracked) records the YAML's mtime and size
+    and is rebuilt when either differs, so short-lived CLI imports skip the much
+    slower YAML parse. It is replaced atomically, so concurrent readers never see
+    a partial file.
+    """
+    stat = models_path.stat()
+    source = [stat.st_mtime_ns, stat.st_size]
+    cache_path = models_path.with_suffix(".json")
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if isinstance(cached, dict) and cached.get("source") == source:
+            return cached["data"]
+    except (OSError, orjson.JSONDecodeError, KeyError):
+        pass
+
+    data = yaml.safe_load(models_path.read_text(encoding="utf-8"))
+    try:
+        payload = orjson.dumps({"source": source, "data": data})
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except (OSError, TypeError):
+        pass  # read-only checkout or non-JSON YAML values; the YAML stays authoritative
+    return data
+
+
+@cache
 def _load_model_registry() -> Dict[str, Dict[str, str]]:
     models_path = Path(__file__).resolve().parents[3] / "data" / "models.yaml"
-    data = yaml.safe_load(models_path.read_text(encoding="utf-8"))
+    data = _read_models_data(models_path)
     registry: Dict[str, Dict[str, str]] = {}
     for entry in data.get("models", []):
         name = entry["name"]
@@ -51,6 +99,66 @@ def _load_model_registry() -> Dict[str, Dict[str, str]]:
 
 MODEL_REGISTRY = _load_model_registry()
 PLACEHOLDER_PATTERN = re.compile(r"\{([^}]+)\}")
+# Registry entries with unset variants dropped, ready to seed per-build tokens.
+_MODEL_TOKENS: Dict[str, Dict[str, str]] = {
+    name: {key: value for key, value in tokens.items() if value is not None}
+    for name, tokens in MODEL_REGISTRY.items()
+}
+_DEALER_FALLBACK_KEYS = ("dealer_code", "city_code", "city", "state")
+
+ConfigTokens = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+@lru_cache(maxsize=4096)
+def _compile_template(tpl: str) -> Tuple[str, ...]:
+    """Split a URL template into alternating literal text and placeholder keys.
+
+    Templates repeat across every model for a dealer, so the regex split runs
+    once per distinct template and URL builds only join strings.
+    """
+    return tuple(PLACEHOLDER_PATTERN.split(tpl))
+
+
+def _normalize_token(key: str, value: Any) -> Any:
+    if key == "city":
+        return _slugify(value)
+    if key == "state":
+        return str(value).strip().lower()
+    return str(value).strip()
+
+
+def _config_tokens(cfg: Any) -> ConfigTokens:
+    """Return the template scope and normalized ``tokens`` of a scraping_config."""
+    scope = cfg.get("template_scope", "relative")
+    tokens = cfg.get("tokens") or {}
+    if not isinstance(tokens, dict):
+        return scope, ()
+    return scope, tuple(
+        (key, _normalize_token(key, value)) for key, value in tokens.items() if value is not None
+    )
+
+
+@lru_cache(maxsize=2048)
+def _cached_config_tokens(raw: str | bytes) -> ConfigTokens:
+    """Serialized-config front for :func:`_config_tokens`; one dealer's config repeats per model."""
+    try:
+        cfg = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        cfg = {}
+    return _config_tokens(cfg)
+
+
+def _resolve_config_tokens(cfg: Any) -> ConfigTokens:
+    if isinstance(cfg, str):
+        return _cached_config_tokens(cfg)
+    if isinstance(cfg, dict):
+        try:
+            raw = orjson.dumps(cfg)
+        except orjson.JSONEncodeError:
+            return _config_tokens(cfg)
+        return _cached_config_tokens(raw)
+    return _config_tokens(cfg)
+
 
 def build_inventory_url(dealer_row: dict, model: str) -> str:
     """Build an inventory URL from a dealer row and model.
@@ -60,38 +168,16 @@ def build_inventory_url(dealer_row: dict, model: str) -> str:
       - scraping_config: {template_scope: 'absolute'|'relative'}
     Placeholders supported: {homepage_url}, {model_slug}, {model_plus}, {model_name_encoded}
     """
-    if model not in MODEL_REGISTRY:
+    model_tokens = _MODEL_TOKENS.get(model)
+    if model_tokens is None:
         raise ValueError(f"Unsupported model: {model}")
     tpl = dealer_row.get("inventory_url_template") or ""
-    cfg = dealer_row.get("scraping_config") or {}
-    if isinstance(cfg, str):
-        try:
-            cfg = json.loads(cfg)
-        except json.JSONDecodeError:
-            cfg = {}
-    scope = cfg.get("template_scope", "relative")
-    model_tokens = MODEL_REGISTRY[model].copy()
-    base_tokens: Dict[str, Any] = {
-        "homepage_url": dealer_row.get("homepage_url") or "",
-        **{k: v for k, v in model_tokens.items() if v is not None},
-    }
-
-    cfg_tokens = {}
-    if isinstance(cfg, dict):
-        cfg_tokens = cfg.get("tokens") or {}
-    if isinstance(cfg_tokens, dict):
-        for key, value in cfg_tokens.items():
-            if value is None:
-                continue
-            if key == "city":
-                base_tokens[key] = _slugify(value)
-            elif key == "state":
-                base_tokens[key] = str(value).strip().lower()
-            else:
-                base_tokens[key] = str(value).strip()
+    scope, cfg_tokens = _resolve_config_tokens(dealer_row.get("scraping_config") or {})
+    base_tokens: Dict[str, Any] = {"homepage_url": dealer_row.get("homepage_url") or "", **model_tokens}
+    base_tokens.update(cfg_tokens)
 
     # Fallbacks from dealer row if not present in config tokens
-    for fallback_key in ("dealer_code", "city_code", "city", "state"):
+    for fallback_key in _DEALER_FALLBACK_KEYS:
         if fallback_key in base_tokens:
             continue
         value = dealer_row.get(fallback_key)
@@ -101,22 +187,22 @@ def build_inventory_url(dealer_row: dict, model: str) -> str:
             slug = _slugify(value)
             if slug:
                 base_tokens[fallback_key] = slug
-        elif fallback_key == "state":
-            base_tokens[fallback_key] = str(value).strip().lower()
         else:
-            base_tokens[fallback_key] = str(value).strip()
+            base_tokens[fallback_key] = _normalize_token(fallback_key, value)
 
     missing: set[str] = set()
 
-    def replace(match: re.Match[str]) -> str:
-        key = match.group(1)
+    pieces = _compile_template(tpl)
+    parts = list(pieces)
+    for index in range(1, len(pieces), 2):
+        key = pieces[index]
         value = base_tokens.get(key)
         if value is None or value == "":
             missing.add(key)
-            return ""
-        return str(value)
-
-    url = PLACEHOLDER_PATTERN.sub(replace, tpl)
+            parts[index] = ""
+        else:
+            parts[index] = str(value)
+    url = "".join(parts)
 
     if missing:
         allowed_missing = {"city_code"}
@@ -127,10 +213,10 @@ def build_inventory_url(dealer_row: dict, model: str) -> str:
                 f"Missing placeholder token(s) {unexpected} for dealer {dealer_id} ({dealer_row.get('homepage_url')})"
             )
         if "city_code" in missing:
-            url = re.sub(r"([?&])cy=(?:(?=&)|$)", lambda m: "?" if m.group(1) == "?" else "", url)
-            url = re.sub(r"([?&])cy=(?:&|$)", lambda m: "?" if m.group(1) == "?" else "", url)
+            url = _EMPTY_CITY_CODE_RE.sub(_drop_city_code, url)
+            url = _EMPTY_CITY_CODE_PARAM_RE.sub(_drop_city_code, url)
         url = url.replace("?&", "?")
-        url = re.sub(r"&&+", "&", url)
+        url = _AMPERSAND_RUN_RE.sub("&", url)
         if url.endswith("&") or url.endswith("?"):
             url = url.rstrip("?&")
 
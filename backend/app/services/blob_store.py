@@ -3,13 +3,31 @@ from __future__ import annotations
 import asyncio
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:  # pragma: no cover - depends on the optional zstandard wheel
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover
+    _zstd = None
+
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
 
 
 class BlobStore:
     async def put_text(self, key: str, content: str) -> str:
         raise NotImplementedError
 
+    async def put_many(self, items: Iterable[Tuple[str, str]]) -> List[str]:
+        """Write each item independently and return the keys that were stored."""
+        written: List[str] = []
+        for key, content in items:
+            try:
+                written.append(await self.put_text(key, content))
+            except Exception:
+                continue
+        return written
+
 
 class LocalBlobStore(BlobStore):
     """Filesystem-backed blob store for storing raw scrape artifacts."""
@@ -17,14 +35,57 @@ class LocalBlobStore(BlobStore):
     def __init__(self, root: Optional[str | Path] = None):
         self.root = Path(root or Path.cwd() / "data" / "raw_blobs")
         self.root.mkdir(parents=True, exist_ok=True)
+        self._known_dirs: Set[Path] = {self.root}
 
     async def put_text(self, key: str, content: str) -> str:
-        path = self.root / key
-        path.parent.mkdir(parents=True, exist_ok=True)
-        await asyncio.to_thread(path.write_text, content, encoding="utf-8")
+        failed = await asyncio.to_thread(self._write_all, [(key, content)])
+        if failed:
+            raise failed[key]
         return str(key)
 
-    def build_key(self, job_id: str, dealer_id: int, suffix: str = "md") -> str:
-        timestamp = int(time.time() * 1000)
+    async def put_many(self, items: Iterable[Tuple[str, str]]) -> List[str]:
+        """Write several blobs with one thread hop and one ``mkdir`` per new directory.
+
+        Items are written independently; the returned keys are the ones stored.
+        """
+        batch = list(items)
+        if not batch:
+            return []
+        failed = await asyncio.to_thread(self._write_all, batch)
+        return [str(key) for key, _ in batch if key not in failed]
+
+    def _write_all(self, items: List[Tuple[str, str]]) -> Dict[str, Exception]:
+        """Write ``items`` and return the error for each key that could not be written."""
+        compressor = None
+        failed: Dict[str, Exception] = {}
+        for key, content in items:
+            try:
+                path = self.root / key
+                parent = path.parent
+                if parent not in self._known_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    self._known_dirs.add(parent)
+                data = content.encode("utf-8")
+                if key.endswith(ZSTD_SUFFIX):
+                    if _zstd is None:
+                        raise RuntimeError(f"zstandard is required to write compressed blob {key!r}")
+                    # Compressors are not safe to share across threads, so each batch gets its own.
+                    compressor = compressor or _zstd.ZstdCompressor(level=ZSTD_LEVEL)
+                    data = compressor.compress(data)
+                try:
+                    path.write_bytes(data)
+                except FileNotFoundError:
+                    # The directory was removed out from under the cache; recreate it once.
+                    parent.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(data)
+            except Exception as exc:
+                failed[key] = exc
+        return failed
+
+    def build_key(self, job_id: str, dealer_id: int, suffix: str = "md", *, compress: bool = False) -> str:
+        """Build a blob key; ``compress`` adds ``.zst`` when zstandard is installed."""
+        timestamp = time.time_ns() // 1_000_000
         filename = f"{dealer_id}_{timestamp}.{suffix}"
+        if compress and _zstd is not None:
+            filename += ZSTD_SUFFIX
         return str(Path(job_id) / filename)
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
+import logging
 import random
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Protocol
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Protocol, Tuple
 
 import httpx
+import orjson
 
 from backend.app.core.settings import settings
 
-RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+BATCH_FAILED_STATUSES: frozenset[str] = frozenset({"failed", "cancelled"})
+# httpx only negotiates HTTP/2 with the optional h2 package (httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class FirecrawlError(Exception):
@@ -29,8 +43,9 @@ class FirecrawlResult:
     metadata: Dict[str, Any]
     source: str  # "scrape" or "extract"
 
-    @property
+    @cached_property
     def best_content(self) -> str:
+        # Cached on first access: results are shared through the client cache and not mutated.
         if self.markdown:
             return self.markdown
         if self.html:
@@ -41,13 +56,17 @@ class FirecrawlResult:
 
 
 class AsyncTransport(Protocol):
-    async def post(
+    def build_request(
         self,
+        method: str,
         path: str,
-        json: Dict[str, Any],
+        *,
         headers: Dict[str, str],
         timeout: float,
-    ) -> httpx.Response: ...
+        content: Optional[bytes] = None,
+    ) -> httpx.Request: ...
+
+    async def send(self, request: httpx.Request) -> httpx.Response: ...
 
     async def close(self) -> None: ...
 
@@ -55,35 +74,42 @@ class AsyncTransport(Protocol):
 class HttpxTransport:
     """httpx-based transport with connection pooling."""
 
-    def __init__(self, base_url: str):
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=None)
+    def __init__(self, base_url: str, *, pool_size: Optional[int] = None):
+        pool_size = pool_size or settings.firecrawl_pool_size
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=None,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=30.0,
+            ),
+        )
 
-    async def post(
+    def build_request(
         self,
+        method: str,
         path: str,
-        json: Dict[str, Any],
+        *,
         headers: Dict[str, str],
         timeout: float,
-    ) -> httpx.Response:
-        return await self._client.post(path, json=json, headers=headers, timeout=timeout)
+        content: Optional[bytes] = None,
+    ) -> httpx.Request:
+        return self._client.build_request(method, path, content=content, headers=headers, timeout=timeout)
+
+    async def send(self, request: httpx.Request) -> httpx.Response:
+        # Streamed so FirecrawlClient can read the body once into its own buffer
+        # instead of httpx collecting chunks and joining them into a second copy.
+        return await self._client.send(request, stream=True)
 
     async def close(self) -> None:
         await self._client.aclose()
 
 
-def _camel(value: str) -> str:
-    components = value.split("_")
-    if not components:
-        return value
-    return components[0] + "".join(c.title() for c in components[1:])
-
-
-def _build_scrape_options(
-    formats: Optional[list[str]] = None,
-    *,
-    proxy: Optional[str] = None,
-) -> Dict[str, Any]:
-    opts = {
+# Options sent with every scrape; only formats and proxy vary per call.
+_BASE_SCRAPE_OPTS = MappingProxyType(
+    {
         "onlyMainContent": True,
         "removeBase64Images": True,
         "skipTlsVerification": True,
@@ -91,16 +117,80 @@ def _build_scrape_options(
         "blockAds": True,
         "maxAge": 14400000,
     }
+)
+
+
+def _build_scrape_options(
+    formats: Optional[list[str]] = None,
+    *,
+    proxy: Optional[str] = None,
+) -> Dict[str, Any]:
     effective_formats = list(formats or [])
     if "rawHtml" not in effective_formats:
         effective_formats.append("rawHtml")
-    if effective_formats:
-        opts["formats"] = effective_formats
+    opts = {**_BASE_SCRAPE_OPTS, "formats": effective_formats}
     if proxy:
         opts["proxy"] = proxy
     return opts
 
 
+class _ResultCache:
+    """LRU of fetch results whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, FirecrawlResult]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[FirecrawlResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: FirecrawlResult) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+async def _read_body(response: httpx.Response) -> bytes | bytearray:
+    """Return the response body, draining a streamed response into a single buffer."""
+    try:
+        return response.content
+    except httpx.ResponseNotRead:
+        pass
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+    return buffer
+
+
 class FirecrawlClient:
     """Thin async client against Firecrawl scrape/extract endpoints."""
 
@@ -112,16 +202,37 @@ class FirecrawlClient:
         timeout: float = 25.0,
         max_attempts: int = 2,
         backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        max_retry_after: Optional[float] = None,
         transport: Optional[AsyncTransport] = None,
+        cache_size: int = 2048,
+        cache_ttl: float = 900.0,
+        batch_poll_interval: float = 2.0,
+        batch_poll_max_interval: float = 15.0,
+        batch_timeout: float = 600.0,
+        max_concurrency: Optional[int] = None,
     ):
         self.api_key = api_key or settings.firecrawl_api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_attempts = max(1, max_attempts)
         self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # Longest Retry-After honoured in place; a longer one fails the request fast so
+        # the caller's concurrency slot is not held for the whole wait.
+        self.max_retry_after = backoff_cap if max_retry_after is None else max_retry_after
         self._transport = transport or HttpxTransport(self.base_url)
         self._owns_transport = transport is None
         self._headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._json_headers = {**self._headers, "Content-Type": "application/json"}
+        # Successful fetches are reused for cache_ttl seconds; cache_size=0 disables this.
+        self._cache = _ResultCache(cache_size, cache_ttl) if cache_size > 0 and cache_ttl > 0 else None
+        self._inflight: Dict[Hashable, asyncio.Future[FirecrawlResult]] = {}
+        self.batch_poll_interval = batch_poll_interval
+        self.batch_poll_max_interval = batch_poll_max_interval
+        self.batch_timeout = batch_timeout
+        # Caps requests in flight (including their retries) across every caller of this client.
+        self._sem = asyncio.Semaphore(max(1, max_concurrency or settings.firecrawl_concurrency))
 
     async def aclose(self) -> None:
         if self._owns_transport:
@@ -133,6 +244,50 @@ class FirecrawlClient:
         *,
         allow_extract_fallback: bool = False,
         proxy: Optional[str] = None,
+    ) -> FirecrawlResult:
+        if self._cache is None:
+            return await self._fetch_uncached(url, allow_extract_fallback=allow_extract_fallback, proxy=proxy)
+
+        key = (url, allow_extract_fallback, proxy)
+        while True:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # Single-flight: share the in-progress request for the same key.
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue  # the leading caller was cancelled, not us; take over
+                raise
+
+        future: asyncio.Future[FirecrawlResult] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch_uncached(url, allow_extract_fallback=allow_extract_fallback, proxy=proxy)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        else:
+            self._cache.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _fetch_uncached(
+        self,
+        url: str,
+        *,
+        allow_extract_fallback: bool,
+        proxy: Optional[str],
     ) -> FirecrawlResult:
         document = await self._scrape(url, proxy=proxy)
         if document.markdown or document.html or not allow_extract_fallback:
@@ -142,6 +297,71 @@ class FirecrawlClient:
             return extract_result
         return document
 
+    async def fetch_many(
+        self,
+        urls: Iterable[str],
+        *,
+        batch_size: int = 50,
+        proxy: Optional[str] = None,
+    ) -> List[FirecrawlResult]:
+        """Scrape many URLs through Firecrawl batch jobs, ``batch_size`` URLs per job.
+
+        Each job is submitted once and polled until it completes, so N URLs cost
+        one request per batch plus polls instead of N scrape calls. Results carry
+        the source URL Firecrawl reports and also prime the :meth:`fetch` cache.
+        URLs Firecrawl could not scrape are simply absent from the result.
+        """
+        pending = list(dict.fromkeys(urls))
+        results: List[FirecrawlResult] = []
+        for start in range(0, len(pending), max(1, batch_size)):
+            batch = pending[start : start + max(1, batch_size)]
+            documents = await self._run_batch_scrape(batch, proxy=proxy)
+            for document in documents:
+                metadata = document.get("metadata") if isinstance(document, dict) else None
+                if not isinstance(metadata, dict):
+                    continue
+                url = metadata.get("sourceURL") or metadata.get("url")
+                if not url:
+                    continue
+                result = self._result_from_scrape_data(url, document)
+                results.append(result)
+                if self._cache is not None:
+                    self._cache.put((url, False, proxy), result)
+        return results
+
+    async def _run_batch_scrape(self, urls: List[str], *, proxy: Optional[str]) -> List[Dict[str, Any]]:
+        payload = {
+            "urls": urls,
+            **_build_scrape_options(["markdown", "html"], proxy=proxy),
+        }
+        body = await self._post("/v2/batch/scrape", payload)
+        job_id = body.get("id")
+        if not body.get("success") or not job_id:
+            raise FirecrawlError(body.get("error", "Firecrawl batch scrape failed"))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_timeout
+        delay = self.batch_poll_interval
+        while True:
+            status_body = await self._get(f"/v2/batch/scrape/{job_id}")
+            status = status_body.get("status")
+            if status == "completed":
+                break
+            if status in BATCH_FAILED_STATUSES:
+                raise FirecrawlError(status_body.get("error") or f"batch scrape {job_id} {status}")
+            if loop.time() + delay > deadline:
+                raise FirecrawlError(f"batch scrape {job_id} did not complete within {self.batch_timeout}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.batch_poll_max_interval)
+
+        documents = list(status_body.get("data") or [])
+        next_page = status_body.get("next")
+        while next_page:
+            page = await self._get(next_page)
+            documents.extend(page.get("data") or [])
+            next_page = page.get("next")
+        return documents
+
     async def _scrape(self, url: str, *, proxy: Optional[str] = None) -> FirecrawlResult:
         payload = {
             "url": url,
@@ -150,7 +370,9 @@ class FirecrawlClient:
         body = await self._post("/v2/scrape", payload)
         if not body.get("success"):
             raise FirecrawlError(body.get("error", "Firecrawl scrape failed"))
-        data = body.get("data") or {}
+        return self._result_from_scrape_data(url, body.get("data") or {})
+
+    def _result_from_scrape_data(self, url: str, data: Dict[str, Any]) -> FirecrawlResult:
         return FirecrawlResult(
             url=url,
             markdown=data.get("markdown"),
@@ -202,30 +424,69 @@ class FirecrawlClient:
         )
 
     async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Built once (body serialized, URL joined, headers merged); retries resend it as is.
+        request = self._transport.build_request(
+            "POST", path, content=orjson.dumps(payload), headers=self._json_headers, timeout=self.timeout
+        )
+        return await self._request(path, request)
+
+    async def _get(self, path: str) -> Dict[str, Any]:
+        request = self._transport.build_request("GET", path, headers=self._headers, timeout=self.timeout)
+        return await self._request(path, request)
+
+    async def _request(self, path: str, request: httpx.Request) -> Dict[str, Any]:
+        async with self._sem:
+            return await self._request_with_retries(path, request)
+
+    async def _request_with_retries(self, path: str, request: httpx.Request) -> Dict[str, Any]:
         attempts = 0
+        delay = 0.0
         last_error: Optional[Exception] = None
         while attempts < self.max_attempts:
             try:
-                response = await self._transport.post(path, json=payload, headers=self._headers, timeout=self.timeout)
+                response = await self._transport.send(request)
             except httpx.RequestError as exc:
                 last_error = exc
-                await self._maybe_wait(attempts)
+                delay = await self._maybe_wait(attempts, delay)
                 attempts += 1
                 continue
 
-            if response.status_code in RETRYABLE_STATUS:
-                last_error = FirecrawlRetryableError(f"Firecrawl returned {response.status_code} for {path}")
-                await self._maybe_wait(attempts)
+            retry_after: Optional[float] = None
+            try:
+                remaining = response.headers.get("X-RateLimit-Remaining")
+                if remaining is not None:
+                    logger.debug("Firecrawl %s: X-RateLimit-Remaining=%s", path, remaining)
+                status = response.status_code
+                if not 200 <= status < 300:
+                    if status in RETRYABLE_STATUS:
+                        if status == 429:
+                            retry_after = _retry_after(response)
+                        raise FirecrawlRetryableError(f"Firecrawl returned {status} for {path}")
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as exc:
+                        raise FirecrawlError(str(exc)) from exc
+                body = await _read_body(response)
+            except (httpx.RequestError, FirecrawlRetryableError) as exc:
+                last_error = exc
+                body = None
+            finally:
+                await response.aclose()
+
+            if body is None:
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    raise FirecrawlRetryableError(
+                        f"Firecrawl asked to retry {path} after {retry_after:.0f}s"
+                    ) from last_error
+                delay = await self._maybe_wait(attempts, delay, retry_after)
                 attempts += 1
                 continue
 
+            # A full decode is cheap next to the request itself, and callers read every
+            # content field (markdown, html and rawHtml all feed parsing or blob storage),
+            # so a lazy/on-demand parser would not skip any of the large strings.
             try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                raise FirecrawlError(str(exc)) from exc
-
-            try:
-                return response.json()
+                return orjson.loads(body)
             except ValueError as exc:
                 raise FirecrawlError("Invalid JSON from Firecrawl") from exc
 
@@ -235,15 +496,28 @@ class FirecrawlClient:
             raise FirecrawlError(str(last_error)) from last_error
         raise FirecrawlError("Firecrawl request failed")
 
-    async def _maybe_wait(self, attempt: int) -> None:
+    async def _maybe_wait(self, attempt: int, prev_delay: float, retry_after: Optional[float] = None) -> float:
+        """Sleep before the next attempt and return the delay used.
+
+        Uses "decorrelated jitter" (each delay drawn from ``[base, 3 * previous]``,
+        capped) so concurrent callers that failed together do not retry in lockstep.
+        A server-provided ``Retry-After`` takes precedence, up to ``max_retry_after``.
+        """
         if attempt >= self.max_attempts - 1:
-            return
-        delay = self.backoff_base * (2 ** attempt)
-        jitter = random.uniform(0, 0.3)
-        await asyncio.sleep(delay + jitter)
+            return prev_delay
+        if retry_after is not None:
+            delay = min(retry_after, self.max_retry_after)
+        else:
+            upper = max(self.backoff_base, prev_delay * 3)
+            delay = min(self.backoff_cap, random.uniform(self.backoff_base, upper))
+        await asyncio.sleep(delay)
+        return delay
 
     @staticmethod
     def _normalize_metadata(metadata: Any) -> Dict[str, Any]:
-        if isinstance(metadata, dict):
-            return {k: v for k, v in metadata.items() if v is not None}
-        return {}
+        if not isinstance(metadata, dict):
+            return {}
+        # Freshly decoded from the response, so a dict without None values can be kept as is.
+        if None not in metadata.values():
+            return metadata
+        return {k: v for k, v in metadata.items() if v is not None}
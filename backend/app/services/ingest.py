@@ -2,44 +2,149 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from backend.app.db import models
 from backend.app.db.session import session_scope
 
 ZERO_JOB_ID = UUID("00000000-0000-0000-0000-000000000000")
+# Keys per IN (...) prefetch query; keeps bind parameter counts well under driver limits.
+PREFETCH_CHUNK_SIZE = 5000
+
+OBSERVATION_COPY_COLUMNS = (
+    ("job_id", "uuid"),
+    ("observed_at", "timestamptz"),
+    ("dealer_id", "int4"),
+    ("vin", "varchar"),
+    ("vdp_url", "text"),
+    ("advertised_price", "numeric"),
+    ("msrp", "numeric"),
+    ("payload", "jsonb"),
+    ("raw_blob_key", "text"),
+    ("source", "text"),
+)
+LISTING_COLUMNS = (
+    "dealer_id",
+    "vin",
+    "vdp_url",
+    "stock_number",
+    "status",
+    "advertised_price",
+    "price_delta_msrp",
+    "first_seen_at",
+    "last_seen_at",
+    "source_rank",
+)
+OBSERVATION_COPY_SQL = "COPY observations ({}) FROM STDIN WITH (FORMAT BINARY)".format(
+    ", ".join(name for name, _ in OBSERVATION_COPY_COLUMNS)
+)
 
 
 def _ensure_utc(dt: Optional[datetime]) -> datetime:
     if dt is None:
         return datetime.now(timezone.utc)
-    if dt.tzinfo is None:
+    tzinfo = dt.tzinfo
+    if tzinfo is timezone.utc:
+        return dt
+    if tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
+def _parse_job_id(value: Optional[str]) -> UUID:
+    if not value:
+        return ZERO_JOB_ID
+    try:
+        return UUID(value)
+    except (ValueError, TypeError):
+        return ZERO_JOB_ID
+
+
 def _as_decimal(value: Any) -> Optional[Decimal]:
     if value is None:
         return None
-    if isinstance(value, Decimal):
+    kind = type(value)
+    if kind is Decimal:
         return value
+    if kind is int:
+        return Decimal(value)
     try:
-        return Decimal(str(value))
+        if kind is str:
+            return Decimal(value)
+        # Floats go through their shortest repr (not Decimal.from_float) so 19.99
+        # stays 19.99 and price-change comparisons match what the column stores.
+        return Decimal(repr(value) if kind is float else str(value))
     except (TypeError, ValueError, ArithmeticError):
         return None
 
 
-def _merge_vehicle(session: Session, vin: str, vehicle_data: Dict[str, Any]) -> models.Vehicle:
-    vehicle = session.get(models.Vehicle, vin)
-    if vehicle is None:
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = list(items)
+    for start in range(0, len(batch), size):
+        yield batch[start : start + size]
+
+
+def _prefetch_vehicles(session: Session, vins: Set[str]) -> Dict[str, models.Vehicle]:
+    vehicles: Dict[str, models.Vehicle] = {}
+    for chunk in _chunked(vins, PREFETCH_CHUNK_SIZE):
+        for vehicle in session.scalars(select(models.Vehicle).where(models.Vehicle.vin.in_(chunk))):
+            vehicles[vehicle.vin] = vehicle
+    return vehicles
+
+
+def _prefetch_listings(
+    session: Session, keys: Set[Tuple[int, str]]
+) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """Load existing listings as plain column dicts; they are written back with :func:`_upsert_listings`."""
+    listings: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    columns = [getattr(models.Listing, name) for name in LISTING_COLUMNS]
+    key_columns = tuple_(models.Listing.dealer_id, models.Listing.vin)
+    for chunk in _chunked(keys, PREFETCH_CHUNK_SIZE):
+        for listing in session.execute(select(*columns).where(key_columns.in_(chunk))).mappings():
+            listings[(listing["dealer_id"], listing["vin"])] = dict(listing)
+    return listings
+
+
+def _upsert_listings(session: Session, listing_rows: List[Dict[str, Any]]) -> None:
+    """Write final listing states with one INSERT ... ON CONFLICT DO UPDATE executemany.
+
+    Rows must have unique (dealer_id, vin) keys; Postgres rejects a statement
+    that updates the same row twice.
+    """
+    if not listing_rows:
+        return
+    stmt = pg_insert(models.Listing)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.Listing.dealer_id, models.Listing.vin],
+        set_={name: stmt.excluded[name] for name in LISTING_COLUMNS[2:]},
+    )
+    session.execute(stmt, listing_rows)
+
+
+def _create_missing_vehicles(
+    session: Session, rows: Iterable[Tuple[str, Dict[str, Any]]], vehicles: Dict[str, models.Vehicle]
+) -> None:
+    """Insert a stub for every unseen VIN in one flush, ahead of listings that reference it."""
+    created = False
+    for vin, row in rows:
+        if vin in vehicles:
+            continue
+        vehicle_data = row.get("vehicle") or {}
         vehicle = models.Vehicle(vin=vin, make=vehicle_data.get("make", ""), model=vehicle_data.get("model", ""))
         session.add(vehicle)
+        vehicles[vin] = vehicle
+        created = True
+    if created:
         session.flush()
 
+
+def _merge_vehicle(vehicle: models.Vehicle, vehicle_data: Dict[str, Any]) -> models.Vehicle:
     mutable_fields = [
         "make",
         "model",
@@ -69,6 +174,18 @@ def _merge_vehicle(session: Session, vin: str, vehicle_data: Dict[str, Any]) ->
     return vehicle
 
 
+def _copy_observations(session: Session, observations: List[tuple]) -> None:
+    """Bulk-load observation tuples (ordered as OBSERVATION_COPY_COLUMNS) via binary COPY."""
+    if not observations:
+        return
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        with cursor.copy(OBSERVATION_COPY_SQL) as copy:
+            copy.set_types([type_name for _, type_name in OBSERVATION_COPY_COLUMNS])
+            for observation in observations:
+                copy.write_row(observation)
+
+
 def upsert_observations_and_listings(rows: List[Dict[str, Any]], source: str) -> Dict[str, int]:
     """Persist observation rows and keep listings/price events in sync.
 
@@ -86,14 +203,28 @@ def upsert_observations_and_listings(rows: List[Dict[str, Any]], source: str) ->
     listings_upserted = 0
     price_events_created = 0
 
+    observations: List[tuple] = []
+    listing_rows: List[Dict[str, Any]] = []
+    price_events: List[Dict[str, Any]] = []
+
     with session_scope() as session:
-        for row in rows:
+        # One IN query per table up front; rows added below are tracked in the same dicts.
+        vins = [row["vin"].upper() for row in rows]
+        listing_keys = {(row["dealer_id"], vin) for row, vin in zip(rows, vins)}
+        vehicles = _prefetch_vehicles(session, set(vins))
+        listings = _prefetch_listings(session, listing_keys)
+        _create_missing_vehicles(session, zip(vins, rows), vehicles)
+        # A batch usually carries one job_id, so each distinct value is parsed once.
+        job_uuids: Dict[Optional[str], UUID] = {None: ZERO_JOB_ID}
+
+        # Observations keep input order; listing changes are grouped per (dealer_id, vin).
+        groups: Dict[Tuple[int, str], List[Tuple[Any, ...]]] = {}
+        for row, vin in zip(rows, vins):
             dealer_id = row["dealer_id"]
-            vin = row["vin"].upper()
             observed_at = _ensure_utc(row.get("observed_at"))
 
             vehicle_data = row.get("vehicle") or {}
-            vehicle = _merge_vehicle(session, vin, vehicle_data)
+            vehicle = _merge_vehicle(vehicles[vin], vehicle_data)
 
             advertised_price = _as_decimal(row.get("advertised_price"))
             msrp = _as_decimal(row.get("msrp"))
@@ -103,81 +234,87 @@ def upsert_observations_and_listings(rows: List[Dict[str, Any]], source: str) ->
                 payload = {**payload, "assumptions": {"ad_price_equals_msrp": True}}
 
             job_id = row.get("job_id")
-            try:
-                job_uuid = UUID(str(job_id)) if job_id else ZERO_JOB_ID
-            except (ValueError, TypeError):
-                job_uuid = ZERO_JOB_ID
-
-            observation = models.Observation(
-                job_id=job_uuid,
-                observed_at=observed_at,
-                dealer_id=dealer_id,
-                vin=vin,
-                vdp_url=row.get("vdp_url"),
-                advertised_price=advertised_price,
-                msrp=msrp,
-                payload=payload,
-                raw_blob_key=row.get("raw_blob_key"),
-                source=row.get("source") or source,
+            job_key = str(job_id) if job_id else None
+            job_uuid = job_uuids.get(job_key)
+            if job_uuid is None:
+                job_uuid = job_uuids[job_key] = _parse_job_id(job_key)
+
+            observations.append(
+                (
+                    job_uuid,
+                    observed_at,
+                    dealer_id,
+                    vin,
+                    row.get("vdp_url"),
+                    advertised_price,
+                    msrp,
+                    payload,
+                    row.get("raw_blob_key"),
+                    row.get("source") or source,
+                )
             )
-            session.add(observation)
             observations_created += 1
-
-            listing = session.execute(
-                select(models.Listing).where(
-                    models.Listing.dealer_id == dealer_id,
-                    models.Listing.vin == vin,
-                )
-            ).scalar_one_or_none()
-
-            source_rank = row.get("source_rank")
-            source_rank_value = int(source_rank) if source_rank is not None else None
-            status = row.get("status") or "available"
-
-            first_seen_at = row.get("first_seen_at")
-            first_seen_at = _ensure_utc(first_seen_at) if first_seen_at else observed_at
-
-            last_seen_at = row.get("last_seen_at")
-            last_seen_at = _ensure_utc(last_seen_at) if last_seen_at else observed_at
-
-            if listing is None:
-                msrp_value = msrp if msrp is not None else vehicle.msrp
-                price_delta = (advertised_price - msrp_value) if advertised_price is not None and msrp_value is not None else None
-
-                listing = models.Listing(
-                    dealer_id=dealer_id,
-                    vin=vin,
-                    vdp_url=row.get("vdp_url"),
-                    stock_number=row.get("stock_number"),
-                    status=status,
-                    advertised_price=advertised_price,
-                    price_delta_msrp=price_delta,
-                    first_seen_at=first_seen_at,
-                    last_seen_at=last_seen_at,
-                    source_rank=source_rank_value or 100,
-                )
-                session.add(listing)
-                listings_upserted += 1
-            else:
-                old_price = listing.advertised_price
-                old_rank = listing.source_rank
-
-                listing.vdp_url = row.get("vdp_url") or listing.vdp_url
-                listing.stock_number = row.get("stock_number") or listing.stock_number
-                listing.status = status or listing.status
+            # vehicle.msrp is captured now because later rows for the same VIN may change it.
+            groups.setdefault((dealer_id, vin), []).append((observed_at, advertised_price, msrp, vehicle.msrp, row))
+
+        for (dealer_id, vin), group in groups.items():
+            if len(group) > 1:
+                # Apply a listing's observations oldest first so the latest one wins;
+                # the sort is stable, so equal timestamps keep input order.
+                group.sort(key=itemgetter(0))
+            listing = listings.get((dealer_id, vin))
+
+            for observed_at, advertised_price, msrp, vehicle_msrp, row in group:
+                source_rank = row.get("source_rank")
+                source_rank_value = int(source_rank) if source_rank is not None else None
+                status = row.get("status") or "available"
+
+                first_seen_at = row.get("first_seen_at")
+                first_seen_at = _ensure_utc(first_seen_at) if first_seen_at else observed_at
+
+                last_seen_at = row.get("last_seen_at")
+                last_seen_at = _ensure_utc(last_seen_at) if last_seen_at else observed_at
+
+                if listing is None:
+                    msrp_value = msrp if msrp is not None else vehicle_msrp
+                    price_delta = (advertised_price - msrp_value) if advertised_price is not None and msrp_value is not None else None
+
+                    listing = {
+                        "dealer_id": dealer_id,
+                        "vin": vin,
+                        "vdp_url": row.get("vdp_url"),
+                        "stock_number": row.get("stock_number"),
+                        "status": status,
+                        "advertised_price": advertised_price,
+                        "price_delta_msrp": price_delta,
+                        "first_seen_at": first_seen_at,
+                        "last_seen_at": last_seen_at,
+                        "source_rank": source_rank_value or 100,
+                    }
+                    listings_upserted += 1
+                    continue
+
+                old_price = listing["advertised_price"]
+                old_rank = listing["source_rank"]
+
+                listing["vdp_url"] = row.get("vdp_url") or listing["vdp_url"]
+                listing["stock_number"] = row.get("stock_number") or listing["stock_number"]
+                listing["status"] = status or listing["status"]
                 if advertised_price is not None:
-                    listing.advertised_price = advertised_price
+                    listing["advertised_price"] = advertised_price
 
-                msrp_value = msrp if msrp is not None else vehicle.msrp
-                effective_price = listing.advertised_price
+                msrp_value = msrp if msrp is not None else vehicle_msrp
+                effective_price = listing["advertised_price"]
                 if effective_price is not None and msrp_value is not None:
-                    listing.price_delta_msrp = effective_price - msrp_value
+                    listing["price_delta_msrp"] = effective_price - msrp_value
 
-                listing.first_seen_at = min(listing.first_seen_at, first_seen_at) if listing.first_seen_at else first_seen_at
-                listing.last_seen_at = max(listing.last_seen_at, last_seen_at) if listing.last_seen_at else last_seen_at
+                current_first = listing["first_seen_at"]
+                listing["first_seen_at"] = min(current_first, first_seen_at) if current_first else first_seen_at
+                current_last = listing["last_seen_at"]
+                listing["last_seen_at"] = max(current_last, last_seen_at) if current_last else last_seen_at
                 if source_rank_value is not None:
                     if old_rank is None or source_rank_value < old_rank:
-                        listing.source_rank = source_rank_value
+                        listing["source_rank"] = source_rank_value
 
                 if (
                     advertised_price is not None
@@ -185,21 +322,33 @@ def upsert_observations_and_listings(rows: List[Dict[str, Any]], source: str) ->
                     and advertised_price != old_price
                 ):
                     delta = advertised_price - old_price
-                    pct = (delta / old_price * Decimal("100")) if old_price != 0 else None
-                    price_event = models.PriceEvent(
-                        dealer_id=dealer_id,
-                        vin=vin,
-                        observed_at=observed_at,
-                        old_price=old_price,
-                        new_price=advertised_price,
-                        delta=delta,
-                        pct=pct,
+                    # pct is informational (NUMERIC(6,2)), so float division is precise enough.
+                    # The shortest repr is kept rather than a fixed number of places, which
+                    # would round twice and can shift the stored value by 0.01.
+                    pct = Decimal(repr(float(delta) / float(old_price) * 100)) if old_price != 0 else None
+                    price_events.append(
+                        {
+                            "dealer_id": dealer_id,
+                            "vin": vin,
+                            "observed_at": observed_at,
+                            "old_price": old_price,
+                            "new_price": advertised_price,
+                            "delta": delta,
+                            "pct": pct,
+                        }
                     )
-                    session.add(price_event)
                     price_events_created += 1
 
                 listings_upserted += 1
 
+            listing_rows.append(listing)
+
+        _upsert_listings(session, listing_rows)
+        _copy_observations(session, observations)
+        if price_events:
+            # Price events are write-only here, so one executemany replaces per-row ORM inserts.
+            session.execute(insert(models.PriceEvent), price_events)
+
     return {
         "observations": observations_created,
         "listings_upserted": listings_upserted,
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
+import logging
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from sqlalchemy import or_, select
+import orjson
+from sqlalchemy import Text, all_, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 
-from backend.app.core.rate_limit import TokenBucket
+from backend.app.core.rate_limit import AdmissionController, KeyedTokenBucket
 from backend.app.db import models
 from backend.app.db.session import session_scope
+from backend.app.parsers._http import aclose_async_clients
 from backend.app.parsers.cdk import (
     parse_inventory as parse_cdk,
     extract_inventory_request as extract_cdk_inventory_request,
@@ -32,11 +37,13 @@ from backend.app.parsers.dealer_alchemy import (
 )
 from backend.app.parsers.dealer_on import (
     parse_inventory as parse_dealer_on,
+    parse_inventory_async as parse_dealer_on_async,
     DealerOnParseError,
 )
 from backend.app.parsers.dealer_socket import parse_inventory as parse_dealer_socket
 from backend.app.parsers.smartpath import (
     parse_inventory as parse_smartpath,
+    parse_inventory_async as parse_smartpath_async,
     SmartPathParseError,
 )
 from backend.app.parsers.team_velocity import (
@@ -50,11 +57,24 @@ from backend.app.services.firecrawl_client import (
     FirecrawlError,
     FirecrawlResult,
     FirecrawlRetryableError,
+    HTTP2_AVAILABLE,
 )
 from backend.app.services.ingest import upsert_observations_and_listings
 
+logger = logging.getLogger(__name__)
+
 MAX_CONCURRENCY = 50
 RPM_LIMIT = 500
+SECONDARY_API_TIMEOUT = 30
+# Parsed rows kept per (parser, page hash) so an unchanged page is not parsed again.
+PARSE_CACHE_SIZE = 256
+# Background raw-blob writers, and the most blobs one of them hands to put_many at once.
+BLOB_WRITERS = 8
+BLOB_WRITE_BATCH = 16
+# Observation upserts from concurrent tasks are merged into one ingest call of up to
+# UPSERT_BATCH_MAX rows, waiting at most UPSERT_MAX_WAIT seconds for a batch to fill.
+UPSERT_BATCH_MAX = 500
+UPSERT_MAX_WAIT = 0.05
 SOURCE_RANK_INVENTORY = 50
 
 PARSER_REGISTRY = {
@@ -71,14 +91,42 @@ PARSER_REGISTRY = {
     "FOX_DEALER": parse_dealer_alchemy,
 }
 
-SMARTPATH_FALLBACK_PARSERS = [
-    ("TEAM_VELOCITY", parse_team_velocity),
-    ("DEALER_INSPIRE", parse_dealer_inspire),
-    ("DEALER_COM", parse_dealer_com),
-    ("DEALERON", parse_dealer_on),
-    ("DEALER_SOCKET", parse_dealer_socket),
-    ("CDK", parse_cdk),
-]
+# Parsers that call dealer APIs have async variants so their HTTP round trips
+# do not block the event loop shared by concurrent scrape tasks.
+ASYNC_PARSERS = {
+    parse_dealer_on: parse_dealer_on_async,
+    parse_smartpath: parse_smartpath_async,
+}
+
+# (backend, parser, marker): a parser with a marker can only yield rows when that
+# lower-case text is in the page, so it is skipped otherwise. The generic markup
+# parsers have no such marker and always run.
+SMARTPATH_FALLBACK_PARSERS = (
+    ("TEAM_VELOCITY", parse_team_velocity, "application/ld+json"),
+    ("DEALER_INSPIRE", parse_dealer_inspire, None),
+    ("DEALER_COM", parse_dealer_com, None),
+    ("DEALERON", parse_dealer_on, "dealeron_tagging_data"),
+    ("DEALER_SOCKET", parse_dealer_socket, None),
+    ("CDK", parse_cdk, None),
+)
+
+SMARTPATH_FALLBACK_URL_TEMPLATES = (
+    "{homepage}/inventory/new/toyota/{slug}",
+    "{homepage}/inventory/new/{slug}",
+    "{homepage}/inventory/new-toyota-{slug}",
+    "{homepage}/inventory/new-{slug}",
+)
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def _run_parser(parser: Callable[[str], List[Dict[str, Any]]], content: str) -> List[Dict[str, Any]]:
+    async_parser = ASYNC_PARSERS.get(parser)
+    if async_parser is not None:
+        return await async_parser(content)
+    return parser(content)
 
 
 class ScrapeOrchestrator:
@@ -91,9 +139,46 @@ class ScrapeOrchestrator:
     ):
         self.firecrawl = firecrawl or FirecrawlClient()
         self.blob_store = blob_store or LocalBlobStore()
-        self.bucket = TokenBucket(RPM_LIMIT)
-        self.sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        # Firecrawl fetches need both a concurrency slot and an RPM token.
+        self.admission = AdmissionController(MAX_CONCURRENCY, RPM_LIMIT)
+        # Secondary inventory APIs (CDK, Algolia, Typesense) are limited per host
+        # rather than sharing the Firecrawl budget.
+        self.host_buckets = KeyedTokenBucket(RPM_LIMIT)
         self.max_attempts = max(1, max_attempts)
+        # Pooled client for the CDK/Algolia/Typesense calls, shared by every task of
+        # the running job(s) and closed when the last one finishes.
+        self._http: Optional[httpx.AsyncClient] = None
+        self._active_jobs = 0
+        self._parse_cache: "OrderedDict[Tuple[Any, str], List[Dict[str, Any]]]" = OrderedDict()
+        # Raw pages are written by background workers; tasks only wait when the queue is full.
+        self._blob_queue: "asyncio.Queue[Tuple[str, str, asyncio.Future]]" = asyncio.Queue(
+            maxsize=MAX_CONCURRENCY * 2
+        )
+        self._upsert_queue: "asyncio.Queue[Tuple[List[Dict[str, Any]], asyncio.Future]]" = asyncio.Queue()
+        self._writers: List[asyncio.Task] = []
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=SECONDARY_API_TIMEOUT,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENCY,
+                    max_keepalive_connections=MAX_CONCURRENCY,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        for writer in self._writers:
+            writer.cancel()
+        await asyncio.gather(*self._writers, return_exceptions=True)
+        self._writers = []
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        # The DealerOn/SmartPath parsers keep their own per-loop pools.
+        await aclose_async_clients()
 
     async def run_job(self, dealers: Iterable[Dict[str, Any]], model: str) -> Dict[str, Any]:
         dealers = list(dealers)
@@ -105,10 +190,52 @@ class ScrapeOrchestrator:
 
         tasks_meta = self._create_job_and_tasks(job_uuid, dealers, model, started_at)
 
-        results = await asyncio.gather(*(self._process_task(job_uuid, meta, model) for meta in tasks_meta))
+        success_count = 0
 
-        success_count = sum(1 for r in results if r["status"] == "success")
-        fail_count = len(results) - success_count
+        async def _run_task(meta: Dict[str, Any]) -> None:
+            # Tally as each task finishes; the TaskGroup drops finished tasks, so no
+            # per-task result is kept for the rest of the job.
+            nonlocal success_count
+            task_started_at = datetime.now(timezone.utc)
+            try:
+                outcome = await self._process_task(job_uuid, meta, model)
+            except Exception as exc:
+                # A failing task is recorded on its own; raising would make the TaskGroup
+                # cancel every sibling and leave them pending.
+                logger.exception("Scrape task %s failed", meta["task_id"])
+                try:
+                    await self._finalize_task(
+                        meta["task_id"],
+                        status="failed",
+                        started_at=task_started_at,
+                        completed_at=datetime.now(timezone.utc),
+                        error=str(exc) or type(exc).__name__,
+                    )
+                except Exception:  # pragma: no cover - the database is unreachable
+                    logger.exception("Could not record failure of scrape task %s", meta["task_id"])
+                return
+            if outcome["status"] == "success":
+                success_count += 1
+
+        self._active_jobs += 1
+        if not self._writers:
+            self._writers = [asyncio.create_task(self._blob_writer()) for _ in range(BLOB_WRITERS)]
+            # A single upsert writer: its ingest call runs in a thread, so the next batch
+            # fills while it commits, and batches never race to insert the same new VIN.
+            self._writers.append(asyncio.create_task(self._upsert_writer()))
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for meta in tasks_meta:
+                    tg.create_task(_run_task(meta))
+        finally:
+            # Every queued upsert and blob is written before the job (or the writers) end.
+            await self._upsert_queue.join()
+            await self._blob_queue.join()
+            self._active_jobs -= 1
+            if not self._active_jobs:
+                await self.aclose()
+
+        fail_count = len(tasks_meta) - success_count
         status = "success" if fail_count == 0 else ("partial" if success_count > 0 else "failed")
 
         self._finalize_job(job_uuid, success_count, fail_count, status)
@@ -144,22 +271,24 @@ class ScrapeOrchestrator:
             session.add(job)
             session.flush()
 
+            tasks: List[models.ScrapeTask] = []
+            pending: List[Tuple[models.ScrapeTask, Dict[str, Any]]] = []
             for dealer in dealers:
                 try:
                     url = build_inventory_url(dealer, model)
                 except Exception as exc:
                     # store failed task immediately
-                    task = models.ScrapeTask(
-                        job_id=job_id,
-                        dealer_id=dealer["id"],
-                        url="",
-                        status="failed",
-                        error=str(exc),
-                        started_at=started_at,
-                        completed_at=started_at,
+                    tasks.append(
+                        models.ScrapeTask(
+                            job_id=job_id,
+                            dealer_id=dealer["id"],
+                            url="",
+                            status="failed",
+                            error=str(exc),
+                            started_at=started_at,
+                            completed_at=started_at,
+                        )
                     )
-                    session.add(task)
-                    session.flush()
                     continue
 
                 task = models.ScrapeTask(
@@ -168,19 +297,27 @@ class ScrapeOrchestrator:
                     url=url,
                     status="pending",
                 )
-                session.add(task)
-                session.flush()
+                tasks.append(task)
+                pending.append((task, dealer))
+
+            # One flush inserts every task (batched INSERT ... RETURNING) and assigns ids.
+            session.add_all(tasks)
+            session.flush()
 
+            for task, dealer in pending:
                 tasks_meta.append(
                     {
                         "task_id": task.id,
                         "dealer": dealer,
-                        "url": url,
+                        "url": task.url,
                     }
                 )
         return tasks_meta
 
     async def _process_task(self, job_id: uuid.UUID, meta: Dict[str, Any], model: str) -> Dict[str, Any]:
+        # One clock read on entry serves as started_at and as every row's observed_at;
+        # each exit path reads the clock once more for completed_at.
+        observed_at = datetime.now(timezone.utc)
         dealer = meta["dealer"]
         url = meta["url"]
         task_id = meta["task_id"]
@@ -190,8 +327,8 @@ class ScrapeOrchestrator:
         config_raw = dealer.get("scraping_config")
         if isinstance(config_raw, str):
             try:
-                config = json.loads(config_raw)
-            except json.JSONDecodeError:
+                config = orjson.loads(config_raw)
+            except orjson.JSONDecodeError:
                 config = {}
         elif isinstance(config_raw, dict):
             config = config_raw
@@ -202,11 +339,15 @@ class ScrapeOrchestrator:
         if isinstance(firecrawl_cfg, dict):
             proxy = firecrawl_cfg.get("proxy")
 
-        observed_at = datetime.now(timezone.utc)
-        await self._update_task_status(task_id, status="running", started_at=observed_at)
-
+        # The task row is written once, when it finishes; started_at is kept until then.
         if parser is None:
-            await self._update_task_status(task_id, status="failed", completed_at=datetime.now(timezone.utc), error=f"No parser for backend {backend}")
+            await self._finalize_task(
+                task_id,
+                status="failed",
+                started_at=observed_at,
+                completed_at=observed_at,
+                error=f"No parser for backend {backend}",
+            )
             return {"status": "failed"}
 
         attempt = 0
@@ -214,17 +355,17 @@ class ScrapeOrchestrator:
         while attempt < self.max_attempts:
             allow_extract = attempt == self.max_attempts - 1
             try:
-                await self.bucket.acquire(1)
-                async with self.sem:
+                async with self.admission:
                     result = await self.firecrawl.fetch(url, allow_extract_fallback=allow_extract, proxy=proxy)
             except FirecrawlRetryableError as exc:
                 last_error = str(exc)
                 attempt += 1
                 continue
             except FirecrawlError as exc:
-                await self._update_task_status(
+                await self._finalize_task(
                     task_id,
                     status="failed",
+                    started_at=observed_at,
                     completed_at=datetime.now(timezone.utc),
                     error=str(exc),
                 )
@@ -233,18 +374,19 @@ class ScrapeOrchestrator:
             raw_html = result.raw_html or result.html or result.best_content
             content = raw_html if parser in {parse_dealer_on, parse_smartpath} else result.best_content
             try:
-                rows = parser(content)
+                rows = await self._parse(parser, content)
             except DealerOnParseError as exc:
+                # Lowered once; the canonical check and both sniffs below reuse it.
                 content_lower = raw_html.lower() if raw_html else ""
                 handled = False
                 last_exc: Optional[Exception] = None
                 adjusted_html = raw_html
-                if adjusted_html and 'rel="canonical"' not in adjusted_html.lower() and url:
+                if adjusted_html and 'rel="canonical"' not in content_lower and url:
                     adjusted_html = f'<link rel="canonical" href="{url}">{adjusted_html}'
 
                 if "smartpath" in content_lower:
                     try:
-                        rows = parse_smartpath(adjusted_html)
+                        rows = await parse_smartpath_async(adjusted_html)
                         handled = True
                     except SmartPathParseError as smart_exc:
                         last_exc = smart_exc
@@ -272,7 +414,7 @@ class ScrapeOrchestrator:
                         continue
 
                     fallback_html = fallback_result.raw_html or fallback_result.html or fallback_result.best_content
-                    fallback_backend, fallback_rows = self._try_fallback_parsers(fallback_html)
+                    fallback_backend, fallback_rows = await self._try_fallback_parsers(fallback_html)
                     if fallback_rows:
                         rows = fallback_rows
                         result = fallback_result
@@ -291,6 +433,9 @@ class ScrapeOrchestrator:
             except Exception as exc:  # pragma: no cover - defensive guard for parser failures
                 last_error = str(exc)
                 break
+            # The page parse above is the inline fast path: dealer APIs are only called
+            # when the markup yielded no rows, and each _fetch_* returns [] without a
+            # request when the page carries no API config.
             if not rows:
                 if backend in {"CDK", "CDK_GLOBAL"} and raw_html:
                     try:
@@ -333,10 +478,13 @@ class ScrapeOrchestrator:
                     raw_result=result,
                     backend_override=effective_backend,
                 )
-                await self._update_task_status(
+                await self._finalize_task(
                     task_id,
                     status="success",
+                    started_at=observed_at,
                     completed_at=datetime.now(timezone.utc),
+                    content_hash=outcome.get("content_hash"),
+                    raw_blob_key=outcome.get("raw_blob_key"),
                 )
                 return {"status": "success", "observations": outcome["observations"]}
 
@@ -349,16 +497,18 @@ class ScrapeOrchestrator:
                 observed_at=observed_at,
                 raw_result=result,
             )
-            await self._update_task_status(
+            await self._finalize_task(
                 task_id,
                 status="success",
+                started_at=observed_at,
                 completed_at=datetime.now(timezone.utc),
             )
             return {"status": "success", "observations": outcome["observations"]}
 
-        await self._update_task_status(
+        await self._finalize_task(
             task_id,
             status="failed",
+            started_at=observed_at,
             completed_at=datetime.now(timezone.utc),
             error=last_error or "unknown_error",
         )
@@ -382,11 +532,10 @@ class ScrapeOrchestrator:
             "Origin": base_url,
             "User-Agent": "Mozilla/5.0 (compatible; VehicleInventoryBot/1.0)",
         }
-        await self.bucket.acquire(1)
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(endpoint, json=request.payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        await self.host_buckets.acquire(parsed_url.netloc)
+        response = await self._http_client().post(endpoint, content=orjson.dumps(request.payload), headers=headers)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
         return parse_cdk_inventory_json(data, base_url=base_url)
 
     async def _fetch_dealer_inspire_inventory(
@@ -405,15 +554,14 @@ class ScrapeOrchestrator:
             "X-Algolia-API-Key": config.api_key,
             "Content-Type": "application/json",
         }
-        await self.bucket.acquire(1)
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                f"https://{config.app_id}-dsn.algolia.net/1/indexes/{config.index}/query",
-                json={"params": params},
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        await self.host_buckets.acquire(f"{config.app_id}-dsn.algolia.net")
+        response = await self._http_client().post(
+            f"https://{config.app_id}-dsn.algolia.net/1/indexes/{config.index}/query",
+            content=orjson.dumps({"params": params}),
+            headers=headers,
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
         parsed_url = urlparse(page_url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         return parse_algolia_hits(data, base_url=base_url)
@@ -453,13 +601,12 @@ class ScrapeOrchestrator:
             payload["searches"][0]["filter_by"] = filter_by
 
         endpoint = f"{config.protocol}://{config.host}:{config.port}/multi_search?use_cache=true"
-        headers = {"X-TYPESENSE-API-KEY": config.api_key}
+        headers = {"X-TYPESENSE-API-KEY": config.api_key, "Content-Type": "application/json"}
 
-        await self.bucket.acquire(1)
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(endpoint, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        await self.host_buckets.acquire(config.host)
+        response = await self._http_client().post(endpoint, headers=headers, content=orjson.dumps(payload))
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         rows = parse_typesense_hits(data, page_url=page_url)
         return rows
@@ -481,8 +628,14 @@ class ScrapeOrchestrator:
         raw_content = raw_result.best_content
         suffix = "md" if raw_result.markdown else "html"
         blob_key = ""
+        blob_stored: Optional[asyncio.Future] = None
+        content_hash = None
         if raw_content:
-            blob_key = await self._store_raw_blob(job_id, dealer_id, raw_content, suffix=suffix)
+            content_hash = _content_hash(raw_content)
+            # An unchanged page points at the blob already stored for it.
+            blob_key = await asyncio.to_thread(self._previous_blob_key, dealer_id, content_hash)
+            if not blob_key:
+                blob_key, blob_stored = await self._queue_raw_blob(job_id, dealer_id, raw_content, suffix=suffix)
 
         prepared_rows = []
         for row in rows:
@@ -517,7 +670,11 @@ class ScrapeOrchestrator:
                 }
             )
 
-        outcome = upsert_observations_and_listings(prepared_rows, source="inventory_list")
+        # Resolved by an upsert writer once these rows are committed, possibly alongside
+        # rows from other tasks.
+        committed: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._upsert_queue.put((prepared_rows, committed))
+        outcome = await committed
 
         observed_vins = {row["vin"].upper() for row in rows if row.get("vin")}
         missing_stats = self._mark_absent_listings(
@@ -527,39 +684,173 @@ class ScrapeOrchestrator:
             observed_at=observed_at,
         )
         outcome.update(missing_stats)
+        if blob_stored is not None and not await blob_stored:
+            # The page never reached the store; unlink it so no row points at a missing blob.
+            await asyncio.to_thread(self._clear_observation_blob_key, dealer_id, observed_at, blob_key)
+            blob_key = ""
+        outcome["content_hash"] = content_hash
+        outcome["raw_blob_key"] = blob_key or None
         return outcome
 
-    async def _store_raw_blob(self, job_id: uuid.UUID, dealer_id: int, content: str, *, suffix: str) -> str:
-        blob_key = ""
+    async def _parse(
+        self, parser: Callable[[str], List[Dict[str, Any]]], content: str
+    ) -> List[Dict[str, Any]]:
+        """Run ``parser``, reusing the rows from an identical page parsed earlier.
+
+        Only pure HTML parsers are cached; async parsers fetch inventory from
+        dealer APIs, so the same page can yield different rows.
+        """
+        if parser in ASYNC_PARSERS or not content:
+            return await _run_parser(parser, content)
+        key = (parser, _content_hash(content))
+        rows = self._parse_cache.get(key)
+        if rows is not None:
+            self._parse_cache.move_to_end(key)
+            return rows
+        rows = parser(content)
+        self._parse_cache[key] = rows
+        if len(self._parse_cache) > PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        return rows
+
+    def _previous_blob_key(self, dealer_id: int, content_hash: str) -> Optional[str]:
+        # A task only records raw_blob_key after the blob writer confirms the write.
+        with session_scope() as session:
+            return session.execute(
+                select(models.ScrapeTask.raw_blob_key)
+                .where(
+                    models.ScrapeTask.dealer_id == dealer_id,
+                    models.ScrapeTask.content_hash == content_hash,
+                    models.ScrapeTask.status == "success",
+                    models.ScrapeTask.raw_blob_key.is_not(None),
+                )
+                .order_by(models.ScrapeTask.id.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+
+    def _raw_blob_key(self, job_id: uuid.UUID, dealer_id: int, *, suffix: str) -> str:
         if isinstance(self.blob_store, LocalBlobStore):
-            key = self.blob_store.build_key(str(job_id), dealer_id, suffix=suffix)
-            blob_key = await self.blob_store.put_text(key, content)
-        else:
-            key = f"{job_id}/{dealer_id}"
-            blob_key = await self.blob_store.put_text(f"{key}.{suffix}", content)
-        return blob_key
+            return self.blob_store.build_key(str(job_id), dealer_id, suffix=suffix, compress=True)
+        return f"{job_id}/{dealer_id}.{suffix}"
+
+    async def _queue_raw_blob(
+        self, job_id: uuid.UUID, dealer_id: int, content: str, *, suffix: str
+    ) -> Tuple[str, asyncio.Future]:
+        """Return the blob key for ``content`` and leave the write to a background writer.
+
+        The returned future resolves to whether the blob was stored.
+        """
+        blob_key = self._raw_blob_key(job_id, dealer_id, suffix=suffix)
+        stored: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._blob_queue.put((blob_key, content, stored))
+        return blob_key, stored
+
+    def _clear_observation_blob_key(self, dealer_id: int, observed_at: datetime, blob_key: str) -> None:
+        with session_scope() as session:
+            session.execute(
+                update(models.Observation)
+                .where(
+                    models.Observation.dealer_id == dealer_id,
+                    models.Observation.observed_at == observed_at,
+                    models.Observation.raw_blob_key == blob_key,
+                )
+                .values(raw_blob_key=None)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _upsert_writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._upsert_queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + UPSERT_MAX_WAIT
+            while size < UPSERT_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._upsert_queue.get(), timeout)
+                except TimeoutError:
+                    break
+                batch.append(entry)
+                size += len(entry[0])
+            try:
+                await self._write_upserts(batch)
+            finally:
+                for _ in batch:
+                    self._upsert_queue.task_done()
+
+    async def _write_upserts(self, batch: List[Tuple[List[Dict[str, Any]], asyncio.Future]]) -> None:
+        """Commit a batch of queued rows and resolve each task's future.
 
-    async def _update_task_status(
+        If the merged call fails, each task's rows are retried on their own so the
+        error only reaches the task it belongs to. Each task is told how many
+        observations it wrote; listing and price-event counts are not split per task.
+        """
+        try:
+            await asyncio.to_thread(
+                upsert_observations_and_listings,
+                [row for rows, _ in batch for row in rows],
+                source="inventory_list",
+            )
+        except Exception as exc:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(exc)
+                return
+            for rows, committed in batch:
+                try:
+                    await asyncio.to_thread(upsert_observations_and_listings, rows, source="inventory_list")
+                except Exception as row_exc:
+                    if not committed.done():
+                        committed.set_exception(row_exc)
+                else:
+                    if not committed.done():
+                        committed.set_result({"observations": len(rows)})
+            return
+        for rows, committed in batch:
+            if not committed.done():
+                committed.set_result({"observations": len(rows)})
+
+    async def _blob_writer(self) -> None:
+        while True:
+            batch = [await self._blob_queue.get()]
+            while len(batch) < BLOB_WRITE_BATCH and not self._blob_queue.empty():
+                batch.append(self._blob_queue.get_nowait())
+            try:
+                written = set(await self.blob_store.put_many([(key, content) for key, content, _ in batch]))
+            except Exception:  # pragma: no cover - keep the writer alive for later blobs
+                logger.exception("Failed to write %d raw blob(s)", len(batch))
+                written = set()
+            failed = [key for key, _, _ in batch if key not in written]
+            if failed:
+                logger.warning("Failed to write raw blob(s): %s", failed)
+            for key, _, stored in batch:
+                if not stored.done():
+                    stored.set_result(key in written)
+                self._blob_queue.task_done()
+
+    async def _finalize_task(
         self,
         task_id: int,
         *,
-        status: Optional[str] = None,
-        started_at: Optional[datetime] = None,
-        completed_at: Optional[datetime] = None,
+        status: str,
+        started_at: datetime,
+        completed_at: datetime,
         error: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        raw_blob_key: Optional[str] = None,
     ) -> None:
+        """Write a task's outcome with a single UPDATE (no SELECT of the row first)."""
+        values: Dict[str, Any] = {"status": status, "started_at": started_at, "completed_at": completed_at}
+        if error:
+            values["error"] = error
+        if content_hash:
+            values["content_hash"] = content_hash
+        if raw_blob_key:
+            values["raw_blob_key"] = raw_blob_key
         with session_scope() as session:
-            task = session.get(models.ScrapeTask, task_id)
-            if not task:
-                return
-            if status:
-                task.status = status
-            if started_at:
-                task.started_at = started_at
-            if completed_at:
-                task.completed_at = completed_at
-            if error:
-                task.error = error
+            session.execute(update(models.ScrapeTask).where(models.ScrapeTask.id == task_id).values(**values))
 
     def _finalize_job(self, job_id: uuid.UUID, success_count: int, fail_count: int, status: str) -> None:
         with session_scope() as session:
@@ -578,20 +869,9 @@ class ScrapeOrchestrator:
 
         model_entry = MODEL_REGISTRY.get(model) or {}
         slug = model_entry.get("model_slug") or model.lower().replace(" ", "-")
-        candidates = [
-            f"{homepage}/inventory/new/toyota/{slug}",
-            f"{homepage}/inventory/new/{slug}",
-            f"{homepage}/inventory/new-toyota-{slug}",
-            f"{homepage}/inventory/new-{slug}",
-        ]
-
-        unique: List[str] = []
-        seen = set()
-        for url in candidates:
-            if url not in seen:
-                unique.append(url)
-                seen.add(url)
-        return unique
+        return list(
+            dict.fromkeys(template.format(homepage=homepage, slug=slug) for template in SMARTPATH_FALLBACK_URL_TEMPLATES)
+        )
 
     async def _handle_no_inventory(
         self,
@@ -605,10 +885,11 @@ class ScrapeOrchestrator:
     ) -> Dict[str, int]:
         dealer_id = dealer["id"]
         blob_key = ""
+        blob_stored: Optional[asyncio.Future] = None
         raw_content = raw_result.best_content or raw_result.raw_html or raw_result.html
         if raw_content:
             suffix = "md" if raw_result.markdown else "html"
-            blob_key = await self._store_raw_blob(job_id, dealer_id, raw_content, suffix=suffix)
+            blob_key, blob_stored = await self._queue_raw_blob(job_id, dealer_id, raw_content, suffix=suffix)
 
         missing_stats = self._mark_absent_listings(
             dealer_id=dealer_id,
@@ -616,6 +897,8 @@ class ScrapeOrchestrator:
             observed_vins=set(),
             observed_at=observed_at,
         )
+        if blob_stored is not None and not await blob_stored:
+            blob_key = ""
         # no new observations created for empty inventory
         return {"observations": 0, **missing_stats, "raw_blob_key": blob_key or None}
 
@@ -632,42 +915,44 @@ class ScrapeOrchestrator:
         First miss → status 'missing'; second consecutive miss → status 'sold'.
         Listings already marked sold remain unchanged.
         """
-        marked_missing = 0
-        marked_sold = 0
+        # Observed VINs are upper-case; seeded listings may not be, so the stored VIN is
+        # upper-cased before the comparison against the single array parameter.
+        not_observed = func.upper(models.Listing.vin) != all_(literal(sorted(observed_vins), ARRAY(Text)))
+        in_scope = (
+            models.Listing.dealer_id == dealer_id,
+            models.Listing.vin.in_(select(models.Vehicle.vin).where(models.Vehicle.model == model)),
+            or_(models.Listing.source_rank.is_(None), models.Listing.source_rank <= SOURCE_RANK_INVENTORY),
+            not_observed,
+        )
+        status = func.lower(models.Listing.status)
 
         with session_scope() as session:
-            stmt = (
-                select(models.Listing)
-                .join(models.Vehicle, models.Vehicle.vin == models.Listing.vin)
-                .where(
-                    models.Listing.dealer_id == dealer_id,
-                    models.Vehicle.model == model,
-                    or_(models.Listing.source_rank.is_(None), models.Listing.source_rank <= SOURCE_RANK_INVENTORY),
+            # Second miss first, so listings marked missing below are not also sold.
+            marked_sold = session.execute(
+                update(models.Listing)
+                .where(*in_scope, status == "missing")
+                .values(
+                    status="sold",
+                    last_seen_at=func.coalesce(models.Listing.last_seen_at, observed_at),
                 )
-            )
-            listings = session.execute(stmt).scalars().all()
-            for listing in listings:
-                vin = (listing.vin or "").upper()
-                if vin in observed_vins:
-                    continue
-                current_status = (listing.status or "").lower()
-                if current_status == "sold":
-                    continue
-                if current_status == "missing":
-                    listing.status = "sold"
-                    listing.last_seen_at = listing.last_seen_at or observed_at
-                    marked_sold += 1
-                else:
-                    listing.status = "missing"
-                    marked_missing += 1
-            session.flush()
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            marked_missing = session.execute(
+                update(models.Listing)
+                .where(*in_scope, status.not_in(("missing", "sold")))
+                .values(status="missing")
+                .execution_options(synchronize_session=False)
+            ).rowcount
 
         return {"marked_missing": marked_missing, "marked_sold": marked_sold}
 
-    def _try_fallback_parsers(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
-        for backend_key, parser_func in SMARTPATH_FALLBACK_PARSERS:
+    async def _try_fallback_parsers(self, html: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        html_lower = html.lower()
+        for backend_key, parser_func, marker in SMARTPATH_FALLBACK_PARSERS:
+            if marker is not None and marker not in html_lower:
+                continue
             try:
-                rows = parser_func(html)
+                rows = await _run_parser(parser_func, html)
             except (DealerOnParseError, SmartPathParseError, TeamVelocityParseError):
                 continue
             except Exception:  # pragma: no cover - defensive
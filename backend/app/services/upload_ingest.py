@@ -5,7 +5,7 @@ import math
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 import pandas as pd
@@ -28,13 +28,13 @@ class UploadProcessingSummary:
     row_errors: List[Dict[str, Any]]
 
 
-def ingest_vehicle_locator_upload(filename: str, content: bytes) -> Dict[str, Any]:
-    if not content:
-        raise ValueError("Uploaded file is empty")
+def ingest_vehicle_locator_upload(filename: str, content: Union[bytes, BinaryIO]) -> Dict[str, Any]:
+    """Ingest a Vehicle Locator export given as raw bytes or a seekable binary stream."""
+    stream = _open_stream(content)
 
     upload_id = _create_upload_stub(filename)
     try:
-        summary = _process_vehicle_locator(upload_id, filename, content)
+        summary = _process_vehicle_locator(upload_id, filename, stream)
     except Exception as exc:  # pragma: no cover - defensive logging
         _mark_upload_failed(upload_id, str(exc))
         raise
@@ -51,6 +51,14 @@ def ingest_vehicle_locator_upload(filename: str, content: bytes) -> Dict[str, An
         }
 
 
+def _open_stream(content: Union[bytes, BinaryIO]) -> BinaryIO:
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    if not stream.read(1):
+        raise ValueError("Uploaded file is empty")
+    stream.seek(0)
+    return stream
+
+
 def _create_upload_stub(filename: str) -> int:
     with session_scope() as session:
         upload = models.Upload(
@@ -90,8 +98,8 @@ def _mark_upload_completed(summary: UploadProcessingSummary) -> None:
         upload.processed_at = datetime.now(timezone.utc)
 
 
-def _process_vehicle_locator(upload_id: int, filename: str, content: bytes) -> UploadProcessingSummary:
-    dataframe = _load_vehicle_locator(filename, content)
+def _process_vehicle_locator(upload_id: int, filename: str, stream: BinaryIO) -> UploadProcessingSummary:
+    dataframe = _load_vehicle_locator(filename, stream)
     if dataframe.empty:
         return UploadProcessingSummary(
             upload_id=upload_id,
@@ -232,13 +240,12 @@ def _process_vehicle_locator(upload_id: int, filename: str, content: bytes) -> U
     )
 
 
-def _load_vehicle_locator(filename: str, content: bytes) -> pd.DataFrame:
-    buffer = io.BytesIO(content)
+def _load_vehicle_locator(filename: str, stream: BinaryIO) -> pd.DataFrame:
     try:
         if filename.lower().endswith(".csv"):
-            df = pd.read_csv(buffer)
+            df = pd.read_csv(stream)
         else:
-            df = pd.read_excel(buffer)
+            df = pd.read_excel(stream)
     except Exception as exc:
         raise ValueError(f"Unable to read spreadsheet: {exc}") from exc
 
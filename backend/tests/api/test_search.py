@@ -102,3 +102,106 @@ def test_search_returns_results_with_filters():
     vins = [row["vin"] for row in data["rows"]]
     assert "JTEABFAJ9RK001234" in vins
     assert "JTENU5JR4R5299999" not in vins
+
+
+def test_search_filters_on_any_stored_status():
+    _truncate_tables()
+    _seed_inventory()
+    with session_scope() as session:
+        listing = session.get(models.Listing, (1, "JTEABFAJ9RK001234"))
+        listing.status = "hold"
+
+    response = client.get("/search", params={"status": "HOLD"})
+    assert response.status_code == 200
+    assert [row["vin"] for row in response.json()["rows"]] == ["JTEABFAJ9RK001234"]
+
+    # Writers fall back to the lower-cased source status, so unknown values filter rather than error.
+    response = client.get("/search", params={"status": "demo"})
+    assert response.status_code == 200
+    assert response.json()["rows"] == []
+
+    response = client.get("/search", params={"status": "all"})
+    assert response.json()["total"] == 2
+
+
+def test_search_total_is_reported_past_last_page():
+    _truncate_tables()
+    _seed_inventory()
+
+    response = client.get("/search", params={"model": "4Runner", "size": 1, "page": 2})
+    data = response.json()
+    assert data["total"] == 2
+    assert [row["vin"] for row in data["rows"]] == ["JTEABFAJ9RK001234"]
+
+    response = client.get("/search", params={"model": "4Runner", "size": 1, "page": 5})
+    data = response.json()
+    assert data["total"] == 2
+    assert data["rows"] == []
+
+
+def test_search_cursor_pagination_walks_all_rows():
+    _truncate_tables()
+    _seed_inventory()
+
+    response = client.get("/search", params={"model": "4Runner", "size": 1})
+    data = response.json()
+    assert [row["vin"] for row in data["rows"]] == ["JTENU5JR4R5299999"]
+    assert data["next_cursor"]
+
+    response = client.get(
+        "/search", params={"model": "4Runner", "size": 1, "cursor": data["next_cursor"]}
+    )
+    data = response.json()
+    assert data["total"] == 2
+    assert [row["vin"] for row in data["rows"]] == ["JTEABFAJ9RK001234"]
+
+    response = client.get(
+        "/search", params={"model": "4Runner", "size": 1, "cursor": data["next_cursor"]}
+    )
+    data = response.json()
+    assert data["rows"] == []
+    assert data["next_cursor"] is None
+
+    response = client.get("/search", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_search_returns_not_modified_for_matching_etag():
+    _truncate_tables()
+    _seed_inventory()
+
+    response = client.get("/search", params={"model": "4Runner"})
+    etag = response.headers["etag"]
+
+    response = client.get("/search", params={"model": "4Runner"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    response = client.get("/search", params={"model": "4Runner", "size": 1, "page": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    response = client.get("/search", params={"model": "4Runner", "sort": "price_desc"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    response = client.get("/search", params={"below_msrp": True}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_search_etag_changes_when_listing_status_changes():
+    _truncate_tables()
+    _seed_inventory()
+
+    response = client.get("/search", params={"status": "all"})
+    etag = response.headers["etag"]
+
+    # What the absent-listing sweep does: status only, count and last_seen_at untouched.
+    with session_scope() as session:
+        session.execute(text("UPDATE listings SET status = 'missing' WHERE vin = 'JTEABFAJ9RK001234'"))
+
+    response = client.get("/search", params={"status": "all"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    statuses = {row["vin"]: row["status"] for row in response.json()["rows"]}
+    assert statuses["JTEABFAJ9RK001234"] == "missing"
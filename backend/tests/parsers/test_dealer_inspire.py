@@ -50,7 +50,18 @@ def test_extract_algolia_config_from_settings():
     assert config.app_id == "SEWJN80HTN"
     assert config.api_key == "179608f32563367799314290254e3e44"
     assert config.index == "westborotoyota-sbm0624_production_inventory"
-    assert config.refinements.get("model") == ["4Runner"]
+    assert config.refinements.get("model") == ("4Runner",)
+
+
+def test_extract_algolia_config_tolerates_braces_inside_strings():
+    html = (
+        "<script>var inventoryLightningSettings = "
+        '{"appId": "APP", "apiKeySearch": "KEY", "inventoryIndex": "idx", "note": "}{"};'
+        "</script>"
+    )
+    config = extract_algolia_config(html)
+    assert config is not None
+    assert config.index == "idx"
 
 
 def test_extract_algolia_config_from_helper_div():
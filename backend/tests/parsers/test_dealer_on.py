@@ -36,6 +36,7 @@ def test_parse_inventory_fetches_api(monkeypatch: pytest.MonkeyPatch) -> None:
     assert called["url"].endswith("/vehicle-pages/cosmos/srp/vehicles/11409/559658")
     assert called["params"]["host"] == "www.petersontoyota.com"
     assert called["params"]["Model"] == "4Runner"
+    assert called["params"]["PageSize"] == "12"
 
     assert len(rows) == 1
     row = rows[0]
@@ -45,3 +46,33 @@ def test_parse_inventory_fetches_api(monkeypatch: pytest.MonkeyPatch) -> None:
     assert row["vdp_url"].startswith("https://www.petersontoyota.com/new-Lumberton-2025-Toyota-4Runner")
     assert row["image_url"] == "https://www.petersontoyota.com/inventoryphotos/1409/jteva5br0s5057991/ip/1.jpg"
     assert row["status"] == "available"
+
+
+@pytest.mark.asyncio
+async def test_parse_inventory_async_matches_sync(monkeypatch: pytest.MonkeyPatch) -> None:
+    html = _load_fixture("sample_srp.html")
+    api_payload = _load_json_fixture("api_response.json")
+
+    async def fake_fetch_async(url: str, params: Dict[str, str]) -> Dict[str, Any]:
+        return api_payload
+
+    monkeypatch.setattr(dealer_on, "_fetch_inventory_json", lambda url, params: api_payload)
+    monkeypatch.setattr(dealer_on, "_fetch_inventory_json_async", fake_fetch_async)
+
+    assert await dealer_on.parse_inventory_async(html) == dealer_on.parse_inventory(html)
+
+
+def test_parse_tagging_data_counts_only_top_level_items() -> None:
+    script = (
+        '{"page": {"items": ["a", "b", "c"], "note": "\\"items\\": [\\"x\\"]"},'
+        ' "items": ["VIN1", "VIN2"], "dealerId": "11409"}'
+    )
+    data, item_count = dealer_on._parse_tagging_data(script)
+    assert item_count == 2
+    assert data["page"]["items"] == ["a", "b", "c"]
+    assert data["dealerId"] == "11409"
+
+    nested_only = '{"page": {"items": ["a", "b", "c"]}, "dealerId": "11409"}'
+    data, item_count = dealer_on._parse_tagging_data(nested_only)
+    assert item_count is None
+    assert data["page"]["items"] == ["a", "b", "c"]
@@ -0,0 +1,18 @@
+import pytest
+
+from backend.app.parsers._http import LoopLocalAsyncClient, aclose_async_clients
+
+
+@pytest.mark.asyncio
+async def test_aclose_async_clients_closes_running_loop_client():
+    pool = LoopLocalAsyncClient()
+    client = pool.get()
+    assert pool.get() is client
+
+    await aclose_async_clients()
+
+    assert client.is_closed
+    replacement = pool.get()
+    assert replacement is not client
+    await pool.aclose()
+    assert replacement.is_closed
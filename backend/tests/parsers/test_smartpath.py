@@ -40,3 +40,19 @@ def test_smartpath_parser(monkeypatch: pytest.MonkeyPatch) -> None:
     assert row["vdp_url"] == "https://www.exampletoyota.com/vehicle/New/2025/Toyota/4Runner/JTEVA5BR0S5057991/"
     assert row["image_url"] == "https://images.example.com/4runner.jpg"
     assert row["status"] == "available"
+
+
+@pytest.mark.asyncio
+async def test_smartpath_parser_async(monkeypatch: pytest.MonkeyPatch) -> None:
+    html = _read_html("sample.html")
+    payload = _read_json("api_response.json")
+
+    async def fake_fetch_async(base_url: str, api_key: str, index_name: str, model_filter: str | None):
+        assert index_name == "vehicles-TOY12345"
+        return [payload["hits"][0]["document"]]
+
+    monkeypatch.setattr(smartpath, "_fetch_typesense_documents_async", fake_fetch_async)
+
+    rows = await smartpath.parse_inventory_async(html)
+    assert [row["vin"] for row in rows] == ["JTEVA5BR0S5057991"]
+    assert rows[0]["advertised_price"] == 42128.0
@@ -15,3 +15,17 @@ def test_team_velocity_parser_extracts_car_data() -> None:
     assert row["msrp"] is None
     assert row["vdp_url"] == "https://www.exampledealer.com/viewdetails/new/jteva5br0s5057991"
     assert row["image_url"] == "https://cdn.example.com/4runner.jpg"
+
+
+def test_team_velocity_parser_matches_ld_json_scripts_in_any_case() -> None:
+    def car(vin: str) -> str:
+        return '{"@type": "Car", "vehicleIdentificationNumber": "%s", "offers": {"price": "40000"}}' % vin
+
+    html = (
+        '<link rel="canonical" href="https://www.exampledealer.com/inventory">'
+        f'<script type="APPLICATION/LD+JSON">{car("JTEVA5BR0S5000001")}</script>'
+        f'<script type="application/ld+json">{car("JTEVA5BR0S5000002")}</script>'
+    )
+    rows = team_velocity.parse_inventory(html)
+    assert [row["vin"] for row in rows] == ["JTEVA5BR0S5000001", "JTEVA5BR0S5000002"]
+    assert len(rows) == len(team_velocity.LD_JSON_RE.findall(html))
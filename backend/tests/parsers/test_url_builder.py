@@ -0,0 +1,22 @@
+import os
+
+import orjson
+
+from backend.app.parsers import url_builder
+
+
+def test_models_sidecar_is_rebuilt_when_yaml_changes(tmp_path):
+    models_path = tmp_path / "models.yaml"
+    models_path.write_text("models:\n  - name: 4Runner\n", encoding="utf-8")
+    sidecar = tmp_path / "models.json"
+
+    assert url_builder._read_models_data(models_path) == {"models": [{"name": "4Runner"}]}
+    assert orjson.loads(sidecar.read_bytes())["data"] == {"models": [{"name": "4Runner"}]}
+
+    # Same mtime as the sidecar: a newer-than check would keep serving the stale copy.
+    stat = sidecar.stat()
+    models_path.write_text("models:\n  - name: Tacoma\n", encoding="utf-8")
+    os.utime(models_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert url_builder._read_models_data(models_path) == {"models": [{"name": "Tacoma"}]}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["models.json", "models.yaml"]
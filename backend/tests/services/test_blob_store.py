@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.app.services.blob_store import LocalBlobStore
+
+
+@pytest.mark.asyncio
+async def test_local_blob_store_put_many_skips_failed_items(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    # A directory where the blob should go makes that single write fail.
+    (tmp_path / "job" / "bad.md").mkdir(parents=True)
+
+    written = await store.put_many([("job/bad.md", "x"), ("job/good.md", "y")])
+
+    assert written == ["job/good.md"]
+    assert (tmp_path / "job" / "good.md").read_text(encoding="utf-8") == "y"
+
+
+@pytest.mark.asyncio
+async def test_local_blob_store_round_trips_compressed_blob(tmp_path):
+    zstd = pytest.importorskip("zstandard")
+    store = LocalBlobStore(tmp_path)
+    key = store.build_key("job", 7, suffix="html", compress=True)
+    assert key.endswith(".html.zst")
+
+    assert await store.put_text(key, "<html>inventory</html>") == key
+
+    compressed = (tmp_path / key).read_bytes()
+    assert zstd.ZstdDecompressor().decompress(compressed).decode("utf-8") == "<html>inventory</html>"
@@ -15,11 +15,14 @@ class FakeTransport:
         self._responses = list(responses)
         self.calls = []
 
-    async def post(self, path, json, headers, timeout):
+    def build_request(self, method, path, *, headers, timeout, content=None):
+        return httpx.Request(method, httpx.URL("https://api.firecrawl.dev").join(path), headers=headers, content=content)
+
+    async def send(self, request):
         if not self._responses:
             raise AssertionError("No more responses configured")
         response = self._responses.pop(0)
-        self.calls.append(path)
+        self.calls.append(request.url.path)
         return response
 
     async def close(self):
@@ -43,6 +46,37 @@ async def test_firecrawl_client_retries_on_retryable_status(monkeypatch):
     await client.aclose()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retry_after", ["86400", "Fri, 31 Dec 2100 23:59:59 GMT"])
+async def test_firecrawl_client_fails_fast_on_long_retry_after(retry_after):
+    response = make_response(429, {"success": False, "error": "rate"})
+    response.headers["Retry-After"] = retry_after
+    transport = FakeTransport([response, make_response(200, {"success": True, "data": {"markdown": "content"}})])
+    client = FirecrawlClient(transport=transport, max_attempts=2)
+    with pytest.raises(FirecrawlRetryableError):
+        await asyncio.wait_for(client.fetch("https://example.com"), timeout=5)
+    assert transport.calls == ["/v2/scrape"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_firecrawl_client_honours_short_retry_after(monkeypatch):
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    response = make_response(429, {"success": False, "error": "rate"})
+    response.headers["Retry-After"] = "3"
+    transport = FakeTransport([response, make_response(200, {"success": True, "data": {"markdown": "content"}})])
+    client = FirecrawlClient(transport=transport, max_attempts=2)
+    result = await client.fetch("https://example.com")
+    assert result.markdown == "content"
+    assert slept == [3.0]
+    await client.aclose()
+
+
 @pytest.mark.asyncio
 async def test_firecrawl_client_extract_fallback_used_when_markdown_missing():
     scrape_body = {"success": True, "data": {"markdown": None, "html": None}}
@@ -59,3 +93,46 @@ async def test_firecrawl_client_extract_fallback_used_when_markdown_missing():
     assert result.source == "extract"
     assert result.markdown == "from extract"
     await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_firecrawl_client_coalesces_and_caches_repeat_fetches():
+    transport = FakeTransport([make_response(200, {"success": True, "data": {"markdown": "content"}})])
+    client = FirecrawlClient(transport=transport)
+    first, second = await asyncio.gather(
+        client.fetch("https://example.com"),
+        client.fetch("https://example.com"),
+    )
+    third = await client.fetch("https://example.com")
+    assert first is second is third
+    assert transport.calls == ["/v2/scrape"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_firecrawl_client_fetch_many_polls_batch_and_pages():
+    def document(url):
+        return {"markdown": f"content for {url}", "metadata": {"sourceURL": url}}
+
+    responses = [
+        make_response(200, {"success": True, "id": "job-1"}),
+        make_response(200, {"status": "scraping", "completed": 1, "total": 2}),
+        make_response(
+            200,
+            {
+                "status": "completed",
+                "data": [document("https://a.example")],
+                "next": "https://api.firecrawl.dev/v2/batch/scrape/job-1?skip=1",
+            },
+        ),
+        make_response(200, {"status": "completed", "data": [document("https://b.example")], "next": None}),
+    ]
+    transport = FakeTransport(responses)
+    client = FirecrawlClient(transport=transport, batch_poll_interval=0)
+    results = await client.fetch_many(["https://a.example", "https://b.example"])
+
+    assert [result.url for result in results] == ["https://a.example", "https://b.example"]
+    assert transport.calls[:2] == ["/v2/batch/scrape", "/v2/batch/scrape/job-1"]
+    cached = await client.fetch("https://b.example")
+    assert cached.markdown == "content for https://b.example"
+    await client.aclose()
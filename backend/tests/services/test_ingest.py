@@ -113,3 +113,34 @@ def test_ingest_creates_listing_observation_and_price_event():
         price_event = session.execute(select(models.PriceEvent)).scalar_one()
         assert price_event.old_price == Decimal("47500")
         assert price_event.new_price == Decimal("46950")
+
+
+def test_ingest_merges_repeated_listing_within_batch():
+    _truncate_tables()
+    dealer_id = _create_dealer()
+    observed_at = datetime(2025, 10, 21, 12, 0, tzinfo=timezone.utc)
+    base_row = {
+        "dealer_id": dealer_id,
+        "vin": "JTENU5JR4R5288888",
+        "msrp": 51230,
+        "status": "available",
+        "job_id": str(uuid.uuid4()),
+        "vehicle": {"make": "Toyota", "model": "4Runner"},
+    }
+    # Latest observation first: it should still be applied last.
+    rows = [
+        {**base_row, "vin": "jtenu5jr4r5288888", "advertised_price": 46950, "observed_at": observed_at + timedelta(hours=1)},
+        {**base_row, "advertised_price": 47500, "observed_at": observed_at},
+    ]
+
+    summary = upsert_observations_and_listings(rows, source="inventory_list")
+    assert summary == {"observations": 2, "listings_upserted": 2, "price_events": 1}
+
+    with session_scope() as session:
+        listing = session.execute(select(models.Listing)).scalar_one()
+        assert listing.advertised_price == Decimal("46950")
+        assert listing.last_seen_at == observed_at + timedelta(hours=1)
+
+        price_event = session.execute(select(models.PriceEvent)).scalar_one()
+        assert price_event.old_price == Decimal("47500")
+        assert price_event.new_price == Decimal("46950")
@@ -85,6 +85,140 @@ async def test_scrape_orchestrator_persists_success(tmp_path):
         assert observation_count == 3
 
 
+@pytest.mark.asyncio
+async def test_scrape_orchestrator_reuses_blob_for_unchanged_page(tmp_path):
+    _truncate_tables()
+    dealer = _seed_dealer()
+    content = Path("backend/tests/parsers/fixtures/dealer_inspire/sample_inventory.md").read_text(encoding="utf-8")
+    results = [
+        FirecrawlResult(url="https://dealer.test/inventory", markdown=content, html=None, raw_html=None, metadata={}, source="scrape")
+        for _ in range(2)
+    ]
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient(results), blob_store=LocalBlobStore(tmp_path))
+
+    await orchestrator.run_job([dealer], model="4Runner")
+    await orchestrator.run_job([dealer], model="4Runner")
+
+    with session_scope() as session:
+        # Observations stay append-only; only the stored blob is shared.
+        assert session.query(models.Observation).count() == 6
+        blob_keys = {task.raw_blob_key for task in session.query(models.ScrapeTask)}
+    assert len(blob_keys) == 1
+    assert len([path for path in tmp_path.rglob("*") if path.is_file()]) == 1
+
+
+@pytest.mark.asyncio
+async def test_scrape_orchestrator_ignores_blob_key_of_unfinished_task(tmp_path):
+    _truncate_tables()
+    dealer = _seed_dealer()
+    content = Path("backend/tests/parsers/fixtures/dealer_inspire/sample_inventory.md").read_text(encoding="utf-8")
+    with session_scope() as session:
+        session.add(
+            models.ScrapeTask(
+                dealer_id=dealer["id"],
+                url="https://dealer.test/inventory",
+                status="pending",
+                content_hash=orchestrator_module._content_hash(content),
+                raw_blob_key="never/written.md",
+            )
+        )
+    result = FirecrawlResult(url="https://dealer.test/inventory", markdown=content, html=None, raw_html=None, metadata={}, source="scrape")
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient([result]), blob_store=LocalBlobStore(tmp_path))
+
+    await orchestrator.run_job([dealer], model="4Runner")
+
+    with session_scope() as session:
+        task = session.query(models.ScrapeTask).filter(models.ScrapeTask.status == "success").one()
+        assert task.raw_blob_key != "never/written.md"
+    assert (tmp_path / task.raw_blob_key).is_file()
+
+
+class FailingBlobStore(LocalBlobStore):
+    async def put_many(self, items):
+        return []
+
+
+@pytest.mark.asyncio
+async def test_scrape_orchestrator_drops_blob_key_when_write_fails(tmp_path):
+    _truncate_tables()
+    dealer = _seed_dealer()
+    content = Path("backend/tests/parsers/fixtures/dealer_inspire/sample_inventory.md").read_text(encoding="utf-8")
+    result = FirecrawlResult(url="https://dealer.test/inventory", markdown=content, html=None, raw_html=None, metadata={}, source="scrape")
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient([result]), blob_store=FailingBlobStore(tmp_path))
+
+    summary = await orchestrator.run_job([dealer], model="4Runner")
+
+    assert summary["status"] == "success"
+    with session_scope() as session:
+        task = session.query(models.ScrapeTask).one()
+        assert task.content_hash is not None
+        assert task.raw_blob_key is None
+        assert {obs.raw_blob_key for obs in session.query(models.Observation)} == {None}
+
+
+@pytest.mark.asyncio
+async def test_scrape_orchestrator_batches_upserts_across_tasks(tmp_path, monkeypatch):
+    _truncate_tables()
+    dealers = [_seed_dealer(), _seed_dealer()]
+    content = Path("backend/tests/parsers/fixtures/dealer_inspire/sample_inventory.md").read_text(encoding="utf-8")
+    results = [
+        FirecrawlResult(url="https://dealer.test/inventory", markdown=content, html=None, raw_html=None, metadata={}, source="scrape")
+        for _ in dealers
+    ]
+    batch_sizes: List[int] = []
+    upsert = orchestrator_module.upsert_observations_and_listings
+
+    def _recording_upsert(rows, source):
+        batch_sizes.append(len(rows))
+        return upsert(rows, source=source)
+
+    monkeypatch.setattr(orchestrator_module, "upsert_observations_and_listings", _recording_upsert)
+    # Hold the batch open until both dealers' rows (3 each) are queued.
+    monkeypatch.setattr(orchestrator_module, "UPSERT_BATCH_MAX", 6)
+    monkeypatch.setattr(orchestrator_module, "UPSERT_MAX_WAIT", 5.0)
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient(results), blob_store=LocalBlobStore(tmp_path))
+
+    summary = await orchestrator.run_job(dealers, model="4Runner")
+
+    assert summary["success_count"] == 2
+    assert batch_sizes == [6]
+    with session_scope() as session:
+        assert session.query(models.Listing).count() == 6
+        assert {task.status for task in session.query(models.ScrapeTask)} == {"success"}
+
+
+@pytest.mark.asyncio
+async def test_scrape_orchestrator_persist_error_fails_only_that_task(tmp_path, monkeypatch):
+    _truncate_tables()
+    dealers = [_seed_dealer(), _seed_dealer()]
+    content = Path("backend/tests/parsers/fixtures/dealer_inspire/sample_inventory.md").read_text(encoding="utf-8")
+    results = [
+        FirecrawlResult(url="https://dealer.test/inventory", markdown=content, html=None, raw_html=None, metadata={}, source="scrape")
+        for _ in dealers
+    ]
+    bad_dealer_id = dealers[0]["id"]
+    upsert = orchestrator_module.upsert_observations_and_listings
+
+    def _flaky_upsert(rows, source):
+        if any(row["dealer_id"] == bad_dealer_id for row in rows):
+            raise RuntimeError("database hiccup")
+        return upsert(rows, source=source)
+
+    monkeypatch.setattr(orchestrator_module, "upsert_observations_and_listings", _flaky_upsert)
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient(results), blob_store=LocalBlobStore(tmp_path))
+
+    summary = await orchestrator.run_job(dealers, model="4Runner")
+
+    assert summary["status"] == "partial"
+    assert (summary["success_count"], summary["fail_count"]) == (1, 1)
+    with session_scope() as session:
+        statuses = {task.dealer_id: (task.status, task.error) for task in session.query(models.ScrapeTask)}
+        job = session.query(models.ScrapeJob).one()
+        assert job.status == "partial"
+    assert statuses[bad_dealer_id] == ("failed", "database hiccup")
+    assert statuses[dealers[1]["id"]] == ("success", None)
+
+
 @pytest.mark.asyncio
 async def test_scrape_orchestrator_records_failure_after_retries(tmp_path):
     _truncate_tables()
@@ -163,3 +297,39 @@ async def test_scrape_orchestrator_no_inventory_marks_missing_then_sold(tmp_path
     with session_scope() as session:
         listing = session.query(models.Listing).one()
         assert listing.status == "sold"
+
+
+def test_mark_absent_listings_moves_missing_then_sold(tmp_path):
+    _truncate_tables()
+    dealer = _seed_dealer()
+    seen_at = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    with session_scope() as session:
+        # Lower-case VIN, as loaded by scripts/seed_from_export.py.
+        session.add(models.Vehicle(vin="jtebu5jr0m5000001", make="Toyota", model="4Runner"))
+        session.flush()
+        session.add(
+            models.Listing(
+                dealer_id=dealer["id"],
+                vin="jtebu5jr0m5000001",
+                status="Available",
+                source_rank=orchestrator_module.SOURCE_RANK_INVENTORY,
+                first_seen_at=seen_at,
+                last_seen_at=seen_at,
+            )
+        )
+    orchestrator = ScrapeOrchestrator(firecrawl=FakeFirecrawlClient([]), blob_store=LocalBlobStore(tmp_path))
+
+    def sweep(observed_vins):
+        stats = orchestrator._mark_absent_listings(
+            dealer_id=dealer["id"],
+            model="4Runner",
+            observed_vins=observed_vins,
+            observed_at=datetime.now(timezone.utc),
+        )
+        with session_scope() as session:
+            return stats, session.query(models.Listing).one().status
+
+    assert sweep({"JTEBU5JR0M5000001"}) == ({"marked_missing": 0, "marked_sold": 0}, "Available")
+    assert sweep(set()) == ({"marked_missing": 1, "marked_sold": 0}, "missing")
+    assert sweep(set()) == ({"marked_missing": 0, "marked_sold": 1}, "sold")
+    assert sweep(set()) == ({"marked_missing": 0, "marked_sold": 0}, "sold")